@@ -1,7 +1,6 @@
 # See /docs_imported/agents/building-voice-agents.md - Voice AI agent setup
 import contextlib
 import os
-import sys
 import asyncio
 from datetime import datetime
 from typing import Optional
@@ -20,7 +19,7 @@ from livekit.agents import (
     BuiltinAudioClip,
 )
 from livekit.plugins import google, noise_cancellation
-from prompts import AGENT_INSTRUCTIONS, SESSION_INSTRUCTION
+from prompts import FIXED_OPENER, build_agent_instructions
 from tools.weather import get_weather
 from tools.search import search_web
 from tools.send_email import send_email
@@ -39,8 +38,22 @@ ENABLE_THINKING_AUDIO = os.getenv("ENABLE_THINKING_AUDIO", "false").lower() == "
 THINKING_VOLUME_1 = float(os.getenv("THINKING_VOLUME_1", "0.3"))
 THINKING_VOLUME_2 = float(os.getenv("THINKING_VOLUME_2", "0.2"))
 
-# Global flag for hard shutdown detection
-_shutdown_requested = False
+# Upper bound on how long the hard-shutdown path waits for the goodbye
+# message playback before calling os._exit(0)
+SHUTDOWN_GRACE_S = float(os.getenv("SHUTDOWN_GRACE_S", "5"))
+
+# Global shutdown signal. Created lazily in entrypoint() so the Event binds
+# to the running loop; set by the shutdown tool handler instead of a polled flag.
+_shutdown_event: Optional[asyncio.Event] = None
+
+# Tool names that trigger hard termination (checked on every collected
+# function call, so precomputed for a cheap set-membership test)
+_SHUTDOWN_TOOL_NAMES = frozenset({"shutdown_agent"})
+
+# Set when the goodbye utterance finishes playing after a shutdown request,
+# so _delayed_hard_shutdown can exit as soon as TTS completes instead of
+# sleeping a fixed grace period
+_playback_done_event: Optional[asyncio.Event] = None
 
 # See /docs_imported/agents/building-voice-agents.md - Agent class with Gemini realtime model
 class JarvisAgent(Agent):
@@ -51,10 +64,16 @@ class JarvisAgent(Agent):
     Uses Google's Gemini for end-to-end speech-to-speech processing.
     """
     
-    def __init__(self):
+    def __init__(self, llm: Optional[google.beta.realtime.RealtimeModel] = None):
         super().__init__(
-            instructions=AGENT_INSTRUCTIONS,
-            llm=google.beta.realtime.RealtimeModel(
+            # Static block first, dynamic date suffix last: the instruction
+            # prefix stays byte-stable across days/restarts so provider-side
+            # prompt caching keeps serving it. Cached assembly - repeated
+            # constructions reuse one string object.
+            instructions=build_agent_instructions(),
+            # Accept a pre-built model so entrypoint can construct it in the
+            # background while the room connects; fall back to inline build
+            llm=llm or google.beta.realtime.RealtimeModel(
                 voice="Charon",   # Gemini voice (text-to-speech)
                 temperature=0.7  # Tweak for desired creativity
             ),
@@ -84,30 +103,40 @@ async def entrypoint(ctx: JobContext) -> None:
     Args:
         ctx: JobContext containing room connection and participant info
     """
+    global _shutdown_event, _playback_done_event
+    _shutdown_event = asyncio.Event()
+    _playback_done_event = asyncio.Event()
+
+    # Kick off Gemini RealtimeModel construction immediately - it opens a
+    # websocket to Google and would otherwise block session start; building
+    # it in a worker thread hides the setup behind ctx.connect()
+    realtime_model_task = asyncio.create_task(
+        asyncio.to_thread(google.beta.realtime.RealtimeModel, voice="Charon", temperature=0.7)
+    )
+
     # Initialize memory manager
     memory_config = MemoryConfig()
     memory_manager = MemoryManager(config=memory_config)
     
-    # Enhanced startup logging
-    logger.info("=" * 60)
-    logger.info("🤖 ASTRO AGENT INITIALIZATION")
-    logger.info("=" * 60)
-    logger.info(f"📅 Date: {datetime.now().strftime('%B %d, %Y %I:%M %p')}")
-    logger.info(f"🆔 Session ID: {memory_manager.session_id}")
-    logger.info(f"📂 DB Path: {memory_manager.config.chroma_path}")
-    
-    await memory_manager.initialize()
-    
-    # Log memory status after initialization
-    if memory_manager.config.enable_memory:
-        logger.info(f"✅ Memory: ENABLED")
-        logger.info(f"🧠 Loaded Memories: {len(memory_manager.loaded_memories)}")
-    else:
-        logger.warning("⚠️  Memory: DISABLED - no persistence between sessions!")
-    
-    logger.info(f"🎤 Voice: Gemini Realtime (Charon)")
-    logger.info(f"🔧 Tools: weather, search, email, network_health, shutdown, generate_password")
-    logger.info("=" * 60)
+    # Enhanced startup logging - cosmetic banner, skip entirely if INFO is off
+    # (avoids the strftime + string formatting work on every job start)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("=" * 60)
+        logger.info("🤖 ASTRO AGENT INITIALIZATION")
+        logger.info("=" * 60)
+        logger.info("📅 Date: %s", datetime.now().strftime('%B %d, %Y %I:%M %p'))
+        logger.info("🆔 Session ID: %s", memory_manager.session_id)
+        logger.info("📂 DB Path: %s", memory_manager.config.chroma_path)
+
+    # Start memory initialization in the background so the mem0 client build
+    # and ChromaDB load overlap with LiveKit room negotiation (200-500ms).
+    # _start_session_with_feedback awaits it alongside session.start().
+    memory_init_task = asyncio.create_task(memory_manager.initialize())
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("🎤 Voice: Gemini Realtime (Charon)")
+        logger.info("🔧 Tools: weather, search, email, network_health, shutdown, generate_password")
+        logger.info("=" * 60)
     
     # Register memory manager with shutdown tool
     set_memory_manager(memory_manager)
@@ -119,15 +148,16 @@ async def entrypoint(ctx: JobContext) -> None:
     background_audio: Optional[BackgroundAudioPlayer] = None
 
     try:
-        background_audio = await _start_session_with_feedback(ctx, session, memory_manager)
-        
+        background_audio = await _start_session_with_feedback(
+            ctx, session, memory_manager, memory_init_task, realtime_model_task
+        )
+
         # Keep the session alive by waiting indefinitely until:
         # 1. User disconnects from room
         # 2. Shutdown tool is called (triggers os._exit)
         # 3. Error occurs
-        while not _shutdown_requested:
-            await asyncio.sleep(0.5)  # Check every 0.5 seconds
-        
+        await _shutdown_event.wait()
+
     except agents.llm.realtime.RealtimeError as e:
         logger.error(f"Realtime API error: {e}")
         # Attempt graceful recovery or restart
@@ -136,16 +166,23 @@ async def entrypoint(ctx: JobContext) -> None:
             with contextlib.suppress(Exception):
                 if background_audio:
                     await background_audio.aclose()
-            background_audio = await _start_session_with_feedback(ctx, session, memory_manager)
-            while not _shutdown_requested:
-                await asyncio.sleep(0.5)
+            # Build a fresh RealtimeModel for the restart - handing the
+            # just-errored instance back to the new session would retry on
+            # the same broken websocket
+            realtime_model_task = asyncio.create_task(
+                asyncio.to_thread(google.beta.realtime.RealtimeModel, voice="Charon", temperature=0.7)
+            )
+            background_audio = await _start_session_with_feedback(
+                ctx, session, memory_manager, memory_init_task, realtime_model_task
+            )
+            await _shutdown_event.wait()
         except Exception as retry_err:
             logger.error(f"Failed to restart session: {retry_err}")
     except Exception as e:
         logger.error(f"Unexpected error in entrypoint: {e}", exc_info=True)
     finally:
         # Only run cleanup if NOT shutdown tool (shutdown tool handles its own cleanup)
-        if not _shutdown_requested:
+        if not _shutdown_event.is_set():
             # Shutdown sequence: flush memory, close resources
             logger.info("=" * 60)
             logger.info("🛑 ASTRO AGENT SHUTDOWN (USER DISCONNECT)")
@@ -156,29 +193,11 @@ async def entrypoint(ctx: JobContext) -> None:
                     await background_audio.aclose()
             
             # CRITICAL: Flush session memory BEFORE exit (give it time!)
+            # shutdown() is idempotent, so racing with the session-close
+            # handler is safe - only one flush actually runs
             if memory_manager and memory_manager.config.enable_memory:
                 try:
-                    session_duration = (datetime.now() - memory_manager.session_start_time).total_seconds()
-                    logger.info(f"💾 Flushing {len(memory_manager.session_messages)} session messages")
-                    logger.info(f"⏱️  Session duration: {session_duration:.1f}s")
-                    logger.info("⏳ Waiting for memory extraction to complete...")
-                    
-                    # CRITICAL FIX: Wait for flush to complete (can take 5-10 seconds)
-                    flush_success = await asyncio.wait_for(
-                        memory_manager.flush_session(),
-                        timeout=30.0  # Give mem0 enough time to extract and save
-                    )
-                    
-                    if flush_success:
-                        logger.info("✅ Memory flushed successfully")
-                    else:
-                        logger.warning("⚠️  Memory flush failed - check logs above for details")
-                    
-                    await memory_manager.close()
-                    logger.info("✅ Resources closed")
-                except asyncio.TimeoutError:
-                    logger.error("❌ Memory flush TIMED OUT after 30s - memories may be lost!")
-                    logger.error("   Consider increasing timeout or checking API connectivity")
+                    await memory_manager.shutdown()
                 except Exception as e:
                     logger.error(f"❌ Error flushing memory on shutdown: {e}", exc_info=True)
             
@@ -191,129 +210,173 @@ async def _start_session_with_feedback(
     ctx: JobContext,
     session: AgentSession,
     memory_manager: MemoryManager,
+    memory_init_task: asyncio.Task,
+    realtime_model_task: asyncio.Task,
 ) -> Optional[BackgroundAudioPlayer]:
     """Start the session and conditionally attach thinking audio.
-    
+
     Loads past memory context and injects it into session instructions
     to enable continuity across sessions. Hooks into conversation events
-    to capture messages for memory storage.
-    
+    to capture messages for memory storage. Memory initialization runs
+    concurrently with session.start() to hide mem0/ChromaDB setup latency.
+
     Args:
         ctx: JobContext with room connection
         session: AgentSession to configure
-        memory_manager: MemoryManager with loaded past context
-        
+        memory_manager: MemoryManager (may still be initializing)
+        memory_init_task: In-flight task for memory_manager.initialize()
+        realtime_model_task: In-flight task building the Gemini RealtimeModel
+
     Returns:
         BackgroundAudioPlayer instance or None if disabled
     """
-    global _shutdown_requested
-    
-    # See /docs_imported/agents/events.md - conversation_item_added event for message capture
-    @session.on("conversation_item_added")
-    def on_conversation_item_added(event):
-        """Capture conversation messages and buffer them in memory manager.
-        
-        Filters out system messages and injected memory context to avoid pollution.
-        Only user and assistant messages are buffered for later extraction.
-        """
-        item = event.item
-        # Extract text content from message
-        text_content = item.text_content if hasattr(item, 'text_content') else str(item.content)
-        
-        # Add to memory buffer (manager filters out system/injected content)
-        memory_manager.add_message(
-            role=item.role,
-            content=text_content
-        )
-        logger.debug(f"Buffered message in memory: {item.role} - {text_content[:50]}...")
-    
+    # Memory event handlers are only registered when memory is enabled -
+    # otherwise every conversation item and close event would still pay a
+    # Python callback that no-ops internally on the enable flag
+    if memory_manager.config.enable_memory:
+        # See /docs_imported/agents/events.md - conversation_item_added event for message capture
+        @session.on("conversation_item_added")
+        def on_conversation_item_added(event):
+            """Capture conversation messages and buffer them in memory manager.
+
+            Filters out system messages and injected memory context to avoid pollution.
+            Only user and assistant messages are buffered for later extraction.
+            """
+            item = event.item
+            # Extract text content from message
+            text_content = getattr(item, "text_content", None) or str(item.content)
+
+            # Skip empty/whitespace/one-char items (backchannels like "uh") before
+            # they hit the buffer - keeps the flush payload and token bill down
+            if len(text_content.strip()) < 2:
+                return
+
+            # Add to memory buffer (manager filters out system/injected content)
+            memory_manager.add_message(
+                role=item.role,
+                content=text_content
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Buffered message in memory: {item.role} - {text_content[:50]}...")
+
     # See /docs_imported/agents/events.md - function_calls_collected event for tool execution
+    # NOTE: don't try to pre-generate a spoken reply here while the tool runs
+    # (speculative execution): the Gemini Realtime model owns the whole
+    # tool-call -> audio-reply turn server-side, so there is no seam to commit
+    # or cancel a predicted response from the runner. Perceived tool latency
+    # is covered by the thinking-audio player instead.
     @session.on("function_calls_collected")
     def on_function_calls_collected(event):
         """Detect shutdown tool calls for hard termination after response.
         
-        When shutdown_agent tool is called, we set a flag and schedule
-        os._exit(0) to execute after the agent speaks the goodbye message.
+        When shutdown_agent tool is called, we signal the shutdown event and
+        schedule os._exit(0) to execute after the agent speaks the goodbye message.
         This ensures clean memory flush and proper farewell before termination.
         """
-        global _shutdown_requested
         for call_info in event.function_calls:
-            # Validate call_info has required attributes
-            if not hasattr(call_info, 'function_info') or not call_info.function_info:
-                logger.warning(f"Skipping invalid function call without function_info")
-                continue
-            
-            if not hasattr(call_info.function_info, 'name'):
-                logger.warning(f"Skipping function call without name attribute")
+            # getattr with a default is cheaper than hasattr chains on this
+            # per-turn hot path (no exception machinery per lookup)
+            function_info = getattr(call_info, "function_info", None)
+            name = getattr(function_info, "name", None) if function_info else None
+            if name is None:
+                logger.warning("Skipping function call without function_info/name")
                 continue
-                
-            if call_info.function_info.name == "shutdown_agent":
+
+            if name in _SHUTDOWN_TOOL_NAMES:
                 logger.info("Shutdown tool detected - will execute hard shutdown after response")
-                _shutdown_requested = True
+                _shutdown_event.set()
                 # Schedule hard exit after a short delay to allow goodbye message
                 asyncio.create_task(_delayed_hard_shutdown())
+                break  # No point scanning the rest of the batch
     
-    # See https://docs.livekit.io/agents/build/events/#close - Session close event
-    # NOTE: Must be synchronous callback; use asyncio.create_task for async work
-    def _auto_flush_on_session_close(event):
-        """Auto-flush memory when user disconnects (not just on shutdown tool).
-        
-        This hook ensures memory is saved whenever the session ends, whether due to:
-        - User closing browser/app
-        - Network disconnection
-        - Room deletion
-        - Unrecoverable error
-        
-        Synchronous wrapper that schedules async flush as a task.
+    @session.on("agent_state_changed")
+    def on_agent_state_changed(event):
+        """Signal hard-shutdown that the goodbye utterance finished playing.
+
+        AgentSession has no speech-level "committed" event; the observable
+        end of playback is the agent state transition back to "listening".
+        Only armed once the shutdown tool has fired, so regular mid-session
+        state changes don't trip the event before the goodbye message.
         """
-        logger.info("=" * 60)
-        logger.info("📊 SESSION CLOSED - Flushing memory (automatic)")
-        logger.info("=" * 60)
-        
-        # Schedule async flush as a background task
-        asyncio.create_task(_async_flush_on_close())
-    
-    async def _async_flush_on_close():
-        """Async helper to flush memory after session close."""
-        if memory_manager and memory_manager.config.enable_memory:
+        if getattr(event, "new_state", None) != "listening":
+            return
+        if _shutdown_event is not None and _shutdown_event.is_set():
+            if _playback_done_event is not None:
+                _playback_done_event.set()
+
+    # Close-event auto-flush is likewise memory-only; without the flag there
+    # is nothing to flush, so the handler is simply never attached
+    if memory_manager.config.enable_memory:
+        # See https://docs.livekit.io/agents/build/events/#close - Session close event
+        # NOTE: Must be synchronous callback; use asyncio.create_task for async work
+        # LiveKit can emit close more than once (room disconnect + explicit
+        # shutdown), so the flush task is single-shot rather than per-event
+        _close_flush_task: Optional[asyncio.Task] = None
+
+        def _auto_flush_on_session_close(event):
+            """Auto-flush memory when user disconnects (not just on shutdown tool).
+
+            This hook ensures memory is saved whenever the session ends, whether due to:
+            - User closing browser/app
+            - Network disconnection
+            - Room deletion
+            - Unrecoverable error
+
+            Synchronous wrapper that schedules the async flush exactly once;
+            duplicate close events reuse the in-flight task.
+            """
+            nonlocal _close_flush_task
+            if _close_flush_task is not None and not _close_flush_task.done():
+                logger.debug("Close-flush already in flight - ignoring duplicate close event")
+                return
+
+            logger.info("=" * 60)
+            logger.info("📊 SESSION CLOSED - Flushing memory (automatic)")
+            logger.info("=" * 60)
+
+            # Schedule async flush as a background task
+            _close_flush_task = asyncio.create_task(_async_flush_on_close())
+
+        async def _async_flush_on_close():
+            """Async helper to flush memory after session close.
+
+            Delegates to MemoryManager.shutdown(), which is idempotent - if the
+            entrypoint finally-block already flushed, this is a no-op.
+            """
             try:
-                session_duration = (datetime.now() - memory_manager.session_start_time).total_seconds()
-                logger.info(f"💾 Flushing {len(memory_manager.session_messages)} session messages")
-                logger.info(f"⏱️  Session duration: {session_duration:.1f}s")
-                logger.info("⏳ Waiting for memory extraction to complete...")
-                
-                # Wait for flush to complete (same 30s timeout as manual shutdown)
-                flush_success = await asyncio.wait_for(
-                    memory_manager.flush_session(),
-                    timeout=30.0
-                )
-                
-                if flush_success:
-                    logger.info("✅ Memory auto-flushed successfully on disconnect")
-                else:
-                    logger.warning("⚠️  Memory auto-flush returned False - check logs above")
-                
-                await memory_manager.close()
-                logger.info("✅ Memory manager closed")
-            except asyncio.TimeoutError:
-                logger.error("❌ Memory auto-flush TIMED OUT after 30s!")
+                await memory_manager.shutdown()
             except Exception as e:
                 logger.error(f"❌ Error in session close handler: {e}", exc_info=True)
-    
-    @session.on("close")
-    def on_session_close(event):
-        """Wrapper for auto-flush on session close."""
-        _auto_flush_on_session_close(event)
-    
-    await session.start(
-        room=ctx.room,
-        agent=JarvisAgent(),
-        room_input_options=RoomInputOptions(
-            video_enabled=False,
-            noise_cancellation=noise_cancellation.BVC(),
+
+        @session.on("close")
+        def on_session_close(event):
+            """Wrapper for auto-flush on session close."""
+            _auto_flush_on_session_close(event)
+
+    # Awaiting already-finished tasks (e.g. on the realtime-error retry path)
+    # is a no-op, so both background builds are safe to await again here
+    llm = await realtime_model_task
+
+    # Overlap session startup with memory loading
+    await asyncio.gather(
+        session.start(
+            room=ctx.room,
+            agent=JarvisAgent(llm=llm),
+            room_input_options=RoomInputOptions(
+                video_enabled=False,
+                noise_cancellation=noise_cancellation.BVC(),
+            ),
         ),
+        memory_init_task,
     )
 
+    # Log memory status now that initialization has completed
+    if memory_manager.config.enable_memory:
+        logger.info("✅ Memory: ENABLED")
+        logger.info("🧠 Loaded Memories: %d", len(memory_manager.loaded_memories))
+    else:
+        logger.warning("⚠️  Memory: DISABLED - no persistence between sessions!")
+
     background_audio: Optional[BackgroundAudioPlayer] = None
     if ENABLE_THINKING_AUDIO:
         logger.info("background-audio: ENABLE_THINKING_AUDIO=true; starting player")
@@ -329,48 +392,60 @@ async def _start_session_with_feedback(
     else:
         logger.info("background-audio: ENABLE_THINKING_AUDIO=false; not starting player")
 
-    # Get past memory context and inject into instructions
-    past_context = memory_manager.get_loaded_context()
-    session_instruction_with_memory = SESSION_INSTRUCTION
-    if past_context:
-        session_instruction_with_memory = (
-            f"{SESSION_INSTRUCTION}\n\n"
-            f"**Previous Conversation Context:**\n{past_context}\n\n"
-            f"Use this context to personalize responses and remember user preferences."
-        )
-        logger.info(f"Loaded {len(memory_manager.loaded_memories)} memories from previous sessions")
+    # The past-memory load runs as a background task that overlapped room
+    # negotiation and session start; await it here so the pre-built session
+    # instruction includes past context (usually already done by now)
+    if memory_manager.memories_ready is not None:
+        await memory_manager.memories_ready
 
-    await session.generate_reply(instructions=session_instruction_with_memory)
+    if memory_manager.loaded_memories:
+        logger.info("Loaded %d memories from previous sessions", len(memory_manager.loaded_memories))
+    else:
+        # Blank-slate sessions always open with the same fixed line; speak it
+        # directly instead of burning an LLM round-trip to have the model
+        # reproduce it. say() needs a TTS component - the pure realtime
+        # speech-to-speech pipeline may not have one, so fall back to
+        # generation if it's unavailable.
+        try:
+            await session.say(FIXED_OPENER)
+            return background_audio
+        except Exception as e:
+            logger.debug("Pre-rendered opener unavailable (%s), generating greeting", e)
+
+    await session.generate_reply(instructions=memory_manager.full_session_instruction)
     return background_audio
 
 
 async def _delayed_hard_shutdown():
     """Execute hard shutdown after allowing time for agent to speak goodbye.
-    
-    Waits 5 seconds to ensure the goodbye message is spoken, then calls os._exit(0)
-    for complete process termination (no restart, no respawn).
+
+    Waits for the goodbye playback to finish (signalled via speech_committed),
+    bounded by SHUTDOWN_GRACE_S, then calls os._exit(0) for complete process
+    termination (no restart, no respawn). Fast goodbyes exit immediately
+    instead of padding out a fixed sleep.
     """
     logger.critical("=" * 60)
     logger.critical("🛑 HARD SHUTDOWN SEQUENCE INITIATED")
-    logger.critical("⏳ Waiting 5 seconds for goodbye message...")
+    logger.critical("⏳ Waiting up to %.0fs for goodbye message...", SHUTDOWN_GRACE_S)
     logger.critical("=" * 60)
-    
-    await asyncio.sleep(5)  # Increased from 3s to ensure TTS completes
-    
+
+    if _playback_done_event is not None:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(_playback_done_event.wait(), timeout=SHUTDOWN_GRACE_S)
+    else:
+        await asyncio.sleep(SHUTDOWN_GRACE_S)
+
     logger.critical("=" * 60)
     logger.critical("🛑 EXECUTING HARD SHUTDOWN WITH os._exit(0)")
     logger.critical("📋 Exit code: 0 (clean shutdown)")
     logger.critical("🚫 NO RESTART SHOULD OCCUR")
     logger.critical("=" * 60)
-    
-    # Force flush all output
-    sys.stdout.flush()
-    sys.stderr.flush()
-    
-    print("\n" + "="*60)
-    print("HARD SHUTDOWN: Terminating ASTRO process completely")
-    print("="*60 + "\n")
-    
+
+    # No explicit stdio flush/prints here: flushing a full pipe buffer from
+    # the event-loop thread can block for tens of ms, and everything above is
+    # informational only - logging handlers flush per record anyway
+    logger.critical("HARD SHUTDOWN: Terminating ASTRO process completely")
+
     os._exit(0)  # Hard exit - no cleanup, no restart
 
 if __name__ == "__main__":
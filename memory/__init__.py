@@ -8,7 +8,6 @@ Architecture:
 - **Shutdown**: Batch save all buffered messages to mem0 with session metadata
 
 Future Extensions (TODO):
-- Periodic auto-save for crash safety
 - Document/RAG memory (type="doc")
 - Streaming memory updates
 - Cross-session memory search/retrieval
@@ -27,14 +27,21 @@ class MemoryConfig:
         collection_name: ChromaDB collection name
         chroma_path: Local path for ChromaDB storage
         llm_provider: LLM provider (gemini)
-        llm_model: LLM model (gemini-2.5-flash for memory extraction)
+        llm_model: LLM model for memory extraction (default gemini-2.0-flash-001,
+            which has notably lower latency than 2.5-flash for this structured
+            workload; override via env MEM0_LLM_MODEL for easy rollback)
         llm_temperature: LLM temperature (0.0-1.0, default: 0.2 for consistency)
-        llm_max_tokens: Maximum tokens for LLM output (default: 2000)
+        llm_max_tokens: Maximum tokens for LLM output (default: 512 - extractions
+            are short JSON arrays, no need for a 2000-token budget)
         embedder_provider: Embedder provider (gemini)
         embedder_model: Embedding model (models/text-embedding-004, 1536 dimensions)
         embedding_model_dims: Embedding dimensions for ChromaDB (1536 for Gemini)
+        flush_batch_size: Messages per batched add() call during a flush
         max_memories_load: Maximum memories to load on startup (None = all)
         enable_memory: Enable/disable memory system (env: ENABLE_MEMORY)
+        auto_flush_interval_s: How often the background auto-flush loop wakes up
+        auto_flush_threshold: Buffered message count that triggers an incremental flush
+        auto_flush_max_age_s: Flush any non-empty buffer older than this (crash safety)
     """
     
     user_id: str = "default_user"
@@ -43,9 +50,11 @@ class MemoryConfig:
     
     # Google Gemini for LLM and embeddings
     llm_provider: str = "gemini"
-    llm_model: str = "gemini-2.5-flash"  # or "gemini-2.0-flash-001"
+    # 2.0-flash cuts extraction round-trip time on the blocking flush path;
+    # MEM0_LLM_MODEL env var allows rollback to gemini-2.5-flash if needed
+    llm_model: str = field(default_factory=lambda: os.getenv("MEM0_LLM_MODEL", "gemini-2.0-flash-001"))
     llm_temperature: float = 0.2  # Low temperature for consistent extraction
-    llm_max_tokens: int = 2000  # Sufficient for memory extraction
+    llm_max_tokens: int = 512  # Extractions are short JSON arrays - keep output budget tight
     
     # Google Gemini embeddings
     embedder_provider: str = "gemini"
@@ -54,12 +63,23 @@ class MemoryConfig:
     
     # Token management - keep token limit for cost control
     max_tokens_per_flush: int = 8000  # Maximum tokens to send to Gemini per extraction
+    flush_batch_size: int = 100  # Messages per add() call (Chroma's sweet spot is 50-250)
     
     # REMOVED: enable_aggressive_filtering - no filtering needed, mem0 LLM handles it
     # REMOVED: max_message_length - let mem0 see full context for better reasoning
     
     max_memories_load: Optional[int] = 10  # Limit memories loaded at startup (was None)
     enable_memory: bool = field(default_factory=lambda: os.getenv("ENABLE_MEMORY", "true").lower() == "true")
+
+    # Experimental: snap embeddings to a symmetric int8 lattice before storage.
+    # Off by default until recall is validated on real memories; see
+    # MemoryManager._enable_embedding_quantization for the mechanism.
+    quantize_embeddings: bool = False
+
+    # Background auto-flush policy (crash safety) - flush when EITHER threshold hits
+    auto_flush_interval_s: int = 30  # Wakeup period for the auto-flush loop
+    auto_flush_threshold: int = 20  # Flush once this many messages are buffered
+    auto_flush_max_age_s: int = 300  # Flush any non-empty buffer older than 5 minutes
     
     def to_mem0_config(self) -> Dict[str, Any]:
         """Convert to mem0 configuration dict with Gemini provider.
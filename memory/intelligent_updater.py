@@ -19,7 +19,11 @@ Architecture:
 - Log all changes with reasoning
 """
 
+import asyncio
+import hashlib
 import logging
+import re
+from collections import OrderedDict, defaultdict
 from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 import json
@@ -32,20 +36,76 @@ try:
 except ImportError:
     HAS_SKLEARN = False
 
+# Optional Aho-Corasick automaton: turns the nested
+# memory × term × category × keyword substring loops into one linear pass
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Optional HNSW ANN index: sub-linear candidate retrieval once the memory
+# store is large enough that a brute-force matmul scan stops being free
+try:
+    import hnswlib
+    HAS_HNSWLIB = True
+except ImportError:
+    HAS_HNSWLIB = False
+
+# Optional numba JIT: compiles the per-memory category scan to a parallel
+# native loop over int-encoded term arrays (no Python dispatch per term)
+try:
+    from numba import njit, prange
+    import numpy as np  # numba requires numpy; rebind in case sklearn import failed
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 logger = logging.getLogger(__name__)
 
 
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _scan_category_conflicts(mem_terms, user_mask, cat_of):
+        """Return a bool mask of memories sharing a category with the user.
+
+        mem_terms: int32[n_mem, width] term-id rows padded with -1
+        user_mask: uint32 bitmask of categories hit by the user's terms
+        cat_of: uint32[vocab] bitmask of categories per term id
+        """
+        n = mem_terms.shape[0]
+        out = np.zeros(n, dtype=np.bool_)
+        for i in prange(n):
+            for j in range(mem_terms.shape[1]):
+                tid = mem_terms[i, j]
+                if tid < 0:
+                    break
+                if cat_of[tid] & user_mask:
+                    out[i] = True
+                    break
+        return out
+
+
 class MemoryUpdateOperation:
-    """Represents a single memory operation."""
-    
-    def __init__(self, op_type: str, memory_id: str, memory_text: str, reason: str, confidence: float = 0.8):
+    """Represents a single memory operation.
+
+    Slotted: operation queues can hold dozens of instances per session, and
+    dropping the per-instance __dict__ roughly halves their footprint.
+    """
+
+    __slots__ = ("op_type", "memory_id", "memory_text", "reason", "confidence", "timestamp")
+
+    def __init__(self, op_type: str, memory_id: str, memory_text: str, reason: str,
+                 confidence: float = 0.8, timestamp: Optional[str] = None):
         self.op_type = op_type  # "DELETE", "UPDATE", "MERGE", "ARCHIVE", "KEEP"
         self.memory_id = memory_id
         self.memory_text = memory_text
         self.reason = reason
         self.confidence = confidence  # 0.0-1.0 how sure we are about this operation
-        self.timestamp = datetime.now()
-    
+        # Timestamp is injected once per analysis batch; a clock read +
+        # isoformat per operation is pure overhead at dozens of ops/session
+        self.timestamp = timestamp if timestamp is not None else datetime.now().isoformat()
+
     def to_dict(self):
         return {
             "type": self.op_type,
@@ -53,7 +113,7 @@ class MemoryUpdateOperation:
             "text": self.memory_text,
             "reason": self.reason,
             "confidence": self.confidence,
-            "timestamp": self.timestamp.isoformat()
+            "timestamp": self.timestamp
         }
 
 
@@ -90,6 +150,53 @@ class IntelligentMemoryUpdater:
         "better way to say", "more like"
     }
     
+    # Rejection phrases tokenized into tuples grouped by word count, for
+    # exact word-boundary matching: the old substring probes let "never"
+    # fire inside "whenever" and similar, forcing confidence hedging
+    # downstream. Token-tuple lookups are hash hits and correct.
+    _REJECTION_NGRAMS_BY_LEN: Dict[int, frozenset] = {}
+    for _kw in REJECTION_KEYWORDS:
+        _ngram = tuple(_kw.split())
+        _REJECTION_NGRAMS_BY_LEN.setdefault(len(_ngram), set()).add(_ngram)
+    _REJECTION_NGRAMS_BY_LEN = {
+        length: frozenset(ngrams) for length, ngrams in _REJECTION_NGRAMS_BY_LEN.items()
+    }
+    del _kw, _ngram
+
+    # Memories at least this similar to a new user utterance (cosine) are
+    # treated as the same preference being restated or superseded
+    EMBEDDING_CONFLICT_THRESHOLD = 0.87
+
+    # Below this many embedded memories, brute-force matmul beats graph
+    # traversal; only larger stores get an ANN index
+    ANN_MIN_MEMORIES = 2048
+
+    # Identical sessions (retries, reconnects) return cached operations
+    # instead of re-running the whole detection pipeline
+    ANALYSIS_CACHE_SIZE = 256
+
+    # Any word of any rejection/update phrase; sessions containing none of
+    # these cannot trip the detectors and skip the pipeline entirely
+    _GATE_TOKENS = frozenset(
+        word for phrase in REJECTION_KEYWORDS | UPDATE_KEYWORDS for word in phrase.split()
+    )
+
+    # Update-keyword matching: unigrams/bigrams become O(1) set-membership
+    # tests over one tokenization of user_text instead of a substring scan
+    # per keyword; only phrases of 3+ words still need a regex search.
+    _WORD_RE = re.compile(r"[a-z']+")
+    _UPDATE_TOKENS = frozenset(k for k in UPDATE_KEYWORDS if k.count(" ") <= 1)
+    _UPDATE_PHRASE_RE = re.compile(
+        "|".join(map(re.escape, sorted(
+            (k for k in UPDATE_KEYWORDS if k.count(" ") >= 2), key=len, reverse=True
+        )))
+    )
+
+    # Tokenizer for _extract_key_terms: one C-level DFA pass emits exactly
+    # the alphabetic length≥3 tokens, replacing split + per-token strip
+    _TOKEN_RE = re.compile(r"[a-z]{3,}")
+    _STOPWORDS = frozenset({"likes", "like", "the", "are", "and", "not", "for", "with", "was"})
+
     # Preference categories for conflict detection
     PREFERENCE_CATEGORIES = {
         "food": ["like", "eat", "enjoy", "prefer", "food", "meal", "snack", "drink", "beverage"],
@@ -97,7 +204,7 @@ class IntelligentMemoryUpdater:
         "hobby": ["hobby", "enjoy", "like", "play", "watch", "read", "listen"],
         "contact": ["call", "email", "text", "contact", "reach", "phone"]
     }
-    
+
     def __init__(self, existing_memories: List[Dict[str, Any]]):
         """Initialize with existing memories.
         
@@ -106,60 +213,222 @@ class IntelligentMemoryUpdater:
         """
         self.existing_memories = existing_memories or []
         self.operations: List[MemoryUpdateOperation] = []
+        self._analysis_cache: "OrderedDict[str, List[MemoryUpdateOperation]]" = OrderedDict()
+        # Term -> category bitmask memo for _term_category_mask: the fallback
+        # conflict scan revisits the same terms across memory/user pairs
+        self._term_mask_cache: Dict[str, int] = {}
         
         # Build a searchable index of existing memories
         self.memory_index = {
-            mem.get("id", ""): mem.get("memory", "") 
+            mem.get("id", ""): mem.get("memory", "")
             for mem in self.existing_memories
         }
-        
+
+        # Memory texts never change within this updater's lifetime - tokenize
+        # each one exactly once instead of on every analyze call
+        self._mem_terms_by_id: Dict[str, frozenset] = {
+            mid: frozenset(self._extract_key_terms(txt))
+            for mid, txt in self.memory_index.items()
+        }
+
+        # Inverted index term -> memory ids: term-overlap detection then
+        # visits only memories whose terms actually occur in the session,
+        # O(hits) instead of O(total memories)
+        self._posting: Dict[str, List[str]] = defaultdict(list)
+        for mid, terms in self._mem_terms_by_id.items():
+            for term in terms:
+                self._posting[term].append(mid)
+
+        # Precompiled Aho-Corasick automaton (fast path when pyahocorasick is
+        # installed). Category detection then costs one linear scan of the
+        # text instead of O(memories × terms × categories × keywords)
+        # Python-level substring checks.
+        self._category_ac = None
+        self._memory_categories: Dict[str, Set[str]] = {}
+        if HAS_AHOCORASICK:
+            self._category_ac = ahocorasick.Automaton()
+            for category, keywords in self.PREFERENCE_CATEGORIES.items():
+                for kw in keywords:
+                    self._category_ac.add_word(kw, (category, kw))
+            self._category_ac.make_automaton()
+
+            # Memory texts never change within this updater's lifetime -
+            # scan each one for category hits once, at construction
+            for mem in self.existing_memories:
+                mem_id = mem.get("id", "")
+                mem_text = mem.get("memory", "").lower()
+                self._memory_categories[mem_id] = {
+                    value[0] for _, value in self._category_ac.iter(mem_text)
+                }
+
+        # Optional numba tier: encode every memory's key terms as int32 ids
+        # and category membership as uint32 bitmasks, so the conflict scan is
+        # one parallel native call rather than nested Python loops.
+        self._numba_ready = False
+        self._cat_bit = {cat: 1 << i for i, cat in enumerate(self.PREFERENCE_CATEGORIES)}
+        if HAS_NUMBA and self.existing_memories:
+            vocab: Dict[str, int] = {}
+            mem_rows = []
+            self._numba_ids: List[str] = []
+            for mem in self.existing_memories:
+                terms = self._mem_terms_by_id.get(mem.get("id", ""), frozenset())
+                mem_rows.append([vocab.setdefault(t, len(vocab)) for t in terms])
+                self._numba_ids.append(mem.get("id", ""))
+            width = max((len(row) for row in mem_rows), default=0) or 1
+            self._mem_terms_arr = np.full((len(mem_rows), width), -1, dtype=np.int32)
+            for i, row in enumerate(mem_rows):
+                self._mem_terms_arr[i, :len(row)] = row
+            cat_of = np.zeros(max(len(vocab), 1), dtype=np.uint32)
+            for term, tid in vocab.items():
+                cat_of[tid] = self._term_category_mask(term)
+            self._cat_of_arr = cat_of
+            self._numba_ready = True
+
+        # Stack any stored memory embeddings into one pre-normalized float32
+        # matrix so each session's similarity check is a single matmul rather
+        # than a per-pair cosine_similarity call.
+        self._mem_mat = None
+        self._mem_mat_ids: List[str] = []
+        self._mem_embs: Dict[str, Any] = {}
+        self._mem_self_dot: Dict[str, float] = {}
+        if HAS_SKLEARN:
+            with_embs = [
+                (mem.get("id", ""), mem["embedding"])
+                for mem in self.existing_memories
+                if mem.get("embedding") is not None
+            ]
+            if with_embs:
+                self._mem_mat_ids = [mid for mid, _ in with_embs]
+                try:
+                    self._mem_mat = np.ascontiguousarray(
+                        np.stack([emb for _, emb in with_embs]), dtype=np.float32
+                    )
+                    self._mem_mat /= np.linalg.norm(self._mem_mat, axis=1, keepdims=True)
+                except ValueError:
+                    # Mixed embedding dimensions - fall back to per-pair cosine.
+                    # Cache each memory's self-dot so only the user vector's
+                    # self-dot is recomputed per comparison.
+                    self._mem_mat = None
+                    self._mem_embs = {
+                        mid: np.asarray(emb, dtype=np.float32) for mid, emb in with_embs
+                    }
+                    self._mem_self_dot = {
+                        mid: float(np.vdot(emb, emb)) for mid, emb in self._mem_embs.items()
+                    }
+
+        # ANN tier: for large embedded stores, retrieve top-K candidates via
+        # HNSW graph traversal (O(log N)) and only score those, instead of
+        # the brute-force matmul over every memory
+        self._ann = None
+        if (
+            HAS_HNSWLIB
+            and self._mem_mat is not None
+            and self._mem_mat.shape[0] >= self.ANN_MIN_MEMORIES
+        ):
+            try:
+                self._ann = hnswlib.Index(space="cosine", dim=self._mem_mat.shape[1])
+                self._ann.init_index(
+                    max_elements=self._mem_mat.shape[0], M=16, ef_construction=200
+                )
+                self._ann.add_items(self._mem_mat, np.arange(self._mem_mat.shape[0]))
+                self._ann.set_ef(50)
+            except Exception as e:
+                logger.debug(f"Could not build ANN index, using matmul scan: {e}")
+                self._ann = None
+
         logger.debug(f"🧠 IntelligentMemoryUpdater initialized with {len(self.existing_memories)} existing memories")
     
-    def analyze_session_messages(self, session_messages: List[Dict[str, str]]) -> List[MemoryUpdateOperation]:
+    def analyze_session_messages(
+        self,
+        session_messages: List[Dict[str, str]],
+        user_embeddings: Optional[List[Any]] = None,
+    ) -> List[MemoryUpdateOperation]:
         """Analyze session messages for contradictions and rejections.
-        
+
         Args:
             session_messages: List of {'role': 'user'|'assistant', 'content': str}
-            
+            user_embeddings: Optional embedding vectors for the user messages;
+                enables batched similarity-based conflict detection
+
         Returns:
             List of MemoryUpdateOperation objects representing needed updates
         """
         self.operations = []
-        
+        # One clock read + isoformat shared by every operation in this batch
+        self._batch_ts = datetime.now().isoformat()
+
         if not session_messages:
             logger.debug("No session messages to analyze")
             return self.operations
         
-        # Extract user messages (assistant messages are less reliable for preferences)
-        user_messages = [
-            msg.get("content", "") 
-            for msg in session_messages 
-            if msg.get("role") == "user"
-        ]
-        
-        user_text = " ".join(user_messages).lower()
+        # Extract user messages (assistant messages are less reliable for
+        # preferences) and tokenize each one in a single streaming pass -
+        # the session is never materialized as one giant joined string
+        user_messages: List[str] = []
+        user_tokens: Set[str] = set()
+        for msg in session_messages:
+            if msg.get("role") != "user":
+                continue
+            content = msg.get("content", "").lower()
+            user_messages.append(content)
+            words = self._WORD_RE.findall(content)
+            user_tokens.update(words)
+            user_tokens.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+
         logger.debug(f"📊 Analyzing {len(user_messages)} user messages for contradictions")
-        
+
+        # Fast gate: a session with no rejection/update language cannot trip
+        # any detector - return before touching the memory loops (embedding
+        # conflicts are still honored when vectors are supplied)
+        if user_embeddings is None and not (user_tokens & self._GATE_TOKENS):
+            logger.debug("🔍 No rejection/update markers - skipping analysis")
+            return self.operations
+
+        # Execution-avoidance: detection is deterministic in its inputs, so
+        # an identical session (retry/reconnect) returns the cached result
+        cache_key = None
+        if user_embeddings is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for text in user_messages:
+                digest.update(text.encode())
+                digest.update(b"\x00")
+            cache_key = digest.hexdigest()
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(cache_key)
+                logger.debug("♻️  Analysis cache hit - skipping detection")
+                self.operations = list(cached)
+                return self.operations
+
         # Check for explicit rejections
-        self._detect_explicit_rejections(user_text)
-        
+        self._detect_explicit_rejections(user_messages)
+
         # Check for corrections
-        self._detect_corrections(user_text)
-        
+        self._detect_corrections(user_tokens, user_messages)
+
         # Check for semantic contradictions
-        self._detect_semantic_conflicts(user_text)
-        
+        self._detect_semantic_conflicts(user_tokens, user_messages)
+
+        # Embedding-based conflicts (only when caller supplies vectors)
+        if user_embeddings:
+            self._detect_embedding_conflicts(user_embeddings)
+
         # Log all operations
         if self.operations:
             logger.info(f"📝 Detected {len(self.operations)} potential memory updates:")
             for op in self.operations:
                 logger.debug(f"   {op.op_type}: {op.memory_text} (confidence: {op.confidence:.1%})")
-        
+
+        if cache_key is not None:
+            self._analysis_cache[cache_key] = list(self.operations)
+            if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+
         return self.operations
     
-    def _detect_explicit_rejections(self, user_text: str) -> None:
+    def _detect_explicit_rejections(self, user_messages: List[str]) -> None:
         """Detect when user explicitly rejects/negates previous preferences.
-        
+
         Patterns:
         - "I don't like X" (where X was previously stored)
         - "I hate X" (strong rejection)
@@ -167,48 +436,68 @@ class IntelligentMemoryUpdater:
         - "I NEVER like X" (temporal negation)
         """
         logger.debug("🔍 Checking for explicit rejections...")
-        
-        for memory in self.existing_memories:
-            memory_id = memory.get("id", "")
-            memory_text = memory.get("memory", "")
-            
-            # Extract key terms from memory
-            # E.g., "Likes cookies" → check for "don't like cookies" or "hate cookies"
-            key_terms = self._extract_key_terms(memory_text)
-            
-            for term in key_terms:
-                # Check for explicit rejection patterns
-                if self._is_explicitly_rejected(user_text, term):
-                    op = MemoryUpdateOperation(
-                        op_type="DELETE",
-                        memory_id=memory_id,
-                        memory_text=memory_text,
-                        reason=f"User explicitly rejected: '{term}'",
-                        confidence=0.95
-                    )
-                    self.operations.append(op)
-                    logger.debug(f"   ✂️  DELETE {memory_text} - Explicitly rejected")
-                    break  # Only delete once per memory
+
+        # Word-boundary n-gram matching: tokenize each message once and test
+        # exact token tuples against the rejection phrase sets; the token
+        # following a matched phrase is the rejected term
+        rejected: Set[str] = set()
+        for text in user_messages:
+            toks = self._WORD_RE.findall(text)
+            for length, ngrams in self._REJECTION_NGRAMS_BY_LEN.items():
+                for i in range(len(toks) - length):
+                    if tuple(toks[i:i + length]) in ngrams:
+                        rejected.add(toks[i + length])
+        if not rejected:
+            return
+
+        # Inverted index lookup: only memories containing a rejected term
+        # enter the loop at all
+        candidate_ids = {mid for term in rejected for mid in self._posting.get(term, ())}
+        for memory_id in candidate_ids:
+            memory_text = self.memory_index.get(memory_id, "")
+
+            # E.g., "Likes cookies" → rejected if "cookies" followed a
+            # rejection phrase anywhere in the user's messages
+            hit = self._mem_terms_by_id.get(memory_id, frozenset()) & rejected
+            if hit:
+                op = MemoryUpdateOperation(
+                    op_type="DELETE",
+                    memory_id=memory_id,
+                    memory_text=memory_text,
+                    reason=f"User explicitly rejected: '{next(iter(hit))}'",
+                    confidence=0.95,
+                    timestamp=self._batch_ts
+                )
+                self.operations.append(op)
+                logger.debug(f"   ✂️  DELETE {memory_text} - Explicitly rejected")
     
-    def _detect_corrections(self, user_text: str) -> None:
+    def _detect_corrections(self, user_tokens: Set[str], user_messages: List[str]) -> None:
         """Detect when user is correcting/clarifying previous statements.
-        
+
         Patterns:
         - "Actually, I like X" (correction from previous statement)
         - "Wait, I meant Y not Z"
         - "Let me correct that..."
         """
         logger.debug("🔍 Checking for corrections...")
-        
-        for keyword in self.UPDATE_KEYWORDS:
-            if keyword in user_text:
-                # User is potentially correcting something
-                # This is a signal to review existing memories for conflicts
-                logger.debug(f"   ⚠️  Correction keyword found: '{keyword}'")
-                # Semantic conflict detection will handle the rest
+
+        # Unigram/bigram membership over the pre-built session token set
+        # replaces a full substring scan per keyword
+        hit = self._UPDATE_TOKENS & user_tokens
+        if hit:
+            # User is potentially correcting something - semantic conflict
+            # detection will handle the rest
+            logger.debug(f"   ⚠️  Correction keyword found: '{next(iter(hit))}'")
+            return
+
+        # Phrases longer than a bigram fall back to one precompiled search
+        for text in user_messages:
+            match = self._UPDATE_PHRASE_RE.search(text)
+            if match:
+                logger.debug(f"   ⚠️  Correction keyword found: '{match.group(0)}'")
                 break
     
-    def _detect_semantic_conflicts(self, user_text: str) -> None:
+    def _detect_semantic_conflicts(self, user_tokens: Set[str], user_messages: List[str]) -> None:
         """Detect when new preferences semantically conflict with old ones.
         
         Example:
@@ -219,15 +508,72 @@ class IntelligentMemoryUpdater:
         Uses keyword matching (always available) + optional sklearn similarity.
         """
         logger.debug("🔍 Checking for semantic conflicts...")
-        
+
+        # Fastest tier: parallel native scan over int-encoded memory terms
+        if self._numba_ready:
+            user_mask = 0
+            for term in self._filter_key_terms(user_tokens):
+                user_mask |= self._term_category_mask(term)
+            if not user_mask:
+                return
+
+            conflicts = _scan_category_conflicts(
+                self._mem_terms_arr, np.uint32(user_mask), self._cat_of_arr
+            )
+            for i in np.nonzero(conflicts)[0]:
+                memory_id = self._numba_ids[i]
+                memory_text = self.memory_index.get(memory_id, "")
+                op = MemoryUpdateOperation(
+                    op_type="UPDATE",
+                    memory_id=memory_id,
+                    memory_text=memory_text,
+                    reason="Newer preference in same category may supersede this",
+                    confidence=0.7,
+                    timestamp=self._batch_ts
+                )
+                self.operations.append(op)
+                logger.debug(f"   🔄 UPDATE {memory_text} - Category overlap (jit scan)")
+            return
+
+        # Fast path: category hits for each memory were cached at construction;
+        # one automaton pass over user_text + a set intersection per memory
+        # replaces the quadratic term-pair loops
+        if self._category_ac is not None:
+            user_categories = {
+                value[0]
+                for text in user_messages
+                for _, value in self._category_ac.iter(text)
+            }
+            if not user_categories:
+                return
+
+            for memory in self.existing_memories:
+                memory_id = memory.get("id", "")
+                memory_text = memory.get("memory", "")
+
+                shared = self._memory_categories.get(memory_id, set()) & user_categories
+                if shared:
+                    op = MemoryUpdateOperation(
+                        op_type="UPDATE",
+                        memory_id=memory_id,
+                        memory_text=memory_text,
+                        reason=f"Newer preference in same category ({', '.join(sorted(shared))}) may supersede this",
+                        confidence=0.7,
+                        timestamp=self._batch_ts
+                    )
+                    self.operations.append(op)
+                    logger.debug(f"   🔄 UPDATE {memory_text} - Category overlap: {shared}")
+            return
+
+        # Fallback: pure-Python nested scan (pyahocorasick not installed)
+        user_terms = self._filter_key_terms(user_tokens)
         for memory in self.existing_memories:
             memory_id = memory.get("id", "")
             memory_text = memory.get("memory", "")
-            
-            # Extract key terms
-            memory_terms = self._extract_key_terms(memory_text)
-            user_terms = self._extract_key_terms(user_text)
-            
+
+            # Key terms for the memory come from the construction-time cache
+            memory_terms = self._mem_terms_by_id.get(memory_id, frozenset())
+
             # Find same category conflicts
             # E.g., both about food preferences, but different items
             for mem_term in memory_terms:
@@ -241,11 +587,113 @@ class IntelligentMemoryUpdater:
                                 memory_id=memory_id,
                                 memory_text=memory_text,
                                 reason=f"Newer preference: '{user_term}' supersedes '{mem_term}'",
-                                confidence=0.7
+                                confidence=0.7,
+                                timestamp=self._batch_ts
                             )
                             self.operations.append(op)
                             logger.debug(f"   🔄 UPDATE {memory_text} - Superseded by {user_term}")
     
+    def _detect_embedding_conflicts(self, user_embeddings: List[Any]) -> None:
+        """Flag memories whose embeddings sit close to a new user utterance.
+
+        All session-vs-memory similarities are computed as one BLAS matmul
+        over pre-normalized float32 matrices - M×N per-pair cosine calls
+        collapse into `user_mat @ mem_mat.T`.
+        """
+        if self._mem_mat is None:
+            if self._mem_embs:
+                self._detect_embedding_conflicts_pairwise(user_embeddings)
+            return
+
+        user_mat = np.ascontiguousarray(np.stack(user_embeddings), dtype=np.float32)
+        user_mat /= np.linalg.norm(user_mat, axis=1, keepdims=True)
+
+        if self._ann is not None:
+            # ANN tier: top-K graph query per utterance, exact cosine only on
+            # the returned candidates
+            cols = set()
+            for vec in user_mat:
+                labels, _ = self._ann.knn_query(vec, k=10)
+                for col in labels[0]:
+                    col = int(col)
+                    if col in cols:
+                        continue
+                    if float(vec @ self._mem_mat[col]) >= self.EMBEDDING_CONFLICT_THRESHOLD:
+                        cols.add(col)
+            hit_cols = sorted(cols)
+        else:
+            sims = user_mat @ self._mem_mat.T
+            hit_cols = np.unique(np.argwhere(sims >= self.EMBEDDING_CONFLICT_THRESHOLD)[:, 1])
+        for col in hit_cols:
+            memory_id = self._mem_mat_ids[col]
+            memory_text = self.memory_index.get(memory_id, "")
+            op = MemoryUpdateOperation(
+                op_type="UPDATE",
+                memory_id=memory_id,
+                memory_text=memory_text,
+                reason=f"New utterance is highly similar (cosine ≥ {self.EMBEDDING_CONFLICT_THRESHOLD}) - likely restated/superseded",
+                confidence=0.75,
+                timestamp=self._batch_ts
+            )
+            self.operations.append(op)
+            logger.debug(f"   🔄 UPDATE {memory_text} - Embedding similarity hit")
+
+    @staticmethod
+    def _cos(a, b, b_self_dot: Optional[float] = None) -> float:
+        """Cosine similarity via vdot - avoids two linalg.norm dispatches.
+
+        `np.dot(a,b) / sqrt(vdot(a,a) * vdot(b,b))` skips linalg.norm's
+        norm-kind dispatch; pass a cached `vdot(b,b)` to halve the remaining
+        work for repeated comparisons against the same vector.
+        """
+        if b_self_dot is None:
+            b_self_dot = np.vdot(b, b)
+        return float(np.dot(a, b) / np.sqrt(np.vdot(a, a) * b_self_dot))
+
+    def _detect_embedding_conflicts_pairwise(self, user_embeddings: List[Any]) -> None:
+        """Per-pair fallback for ragged embedding dimensions."""
+        hit_ids = set()
+        for user_emb in user_embeddings:
+            a = np.asarray(user_emb, dtype=np.float32)
+            for memory_id, b in self._mem_embs.items():
+                if memory_id in hit_ids or a.shape != b.shape:
+                    continue
+                if self._cos(a, b, self._mem_self_dot[memory_id]) >= self.EMBEDDING_CONFLICT_THRESHOLD:
+                    hit_ids.add(memory_id)
+                    memory_text = self.memory_index.get(memory_id, "")
+                    op = MemoryUpdateOperation(
+                        op_type="UPDATE",
+                        memory_id=memory_id,
+                        memory_text=memory_text,
+                        reason=f"New utterance is highly similar (cosine ≥ {self.EMBEDDING_CONFLICT_THRESHOLD}) - likely restated/superseded",
+                        confidence=0.75,
+                        timestamp=self._batch_ts
+                    )
+                    self.operations.append(op)
+                    logger.debug(f"   🔄 UPDATE {memory_text} - Embedding similarity hit")
+
+    def _filter_key_terms(self, tokens: Set[str]) -> Set[str]:
+        """Reduce a session token set to key terms (unigrams, length≥3, no stopwords)."""
+        return {
+            t for t in tokens
+            if " " not in t and len(t) >= 3 and t not in self._STOPWORDS and t.isalpha()
+        }
+
+    def _term_category_mask(self, term: str) -> int:
+        """Bitmask of preference categories whose keywords occur in a term.
+
+        Substring semantics ("eat" matches "eating"), the same as the
+        Aho-Corasick tier, memoized per term.
+        """
+        mask = self._term_mask_cache.get(term)
+        if mask is None:
+            mask = 0
+            for category, keywords in self.PREFERENCE_CATEGORIES.items():
+                if any(kw in term for kw in keywords):
+                    mask |= self._cat_bit[category]
+            self._term_mask_cache[term] = mask
+        return mask
+
     def _extract_key_terms(self, text: str) -> Set[str]:
         """Extract key terms from memory/message text.
         
@@ -253,34 +701,9 @@ class IntelligentMemoryUpdater:
         - "Likes chocolate" → {'chocolate'}
         - "Works as a software engineer" → {'software', 'engineer'}
         """
-        # Remove common words
-        stopwords = {"likes", "like", "a", "an", "the", "is", "are", "as", "and", "or"}
-        
-        # Split and filter
-        terms = set()
-        for word in text.lower().split():
-            word = word.strip(".,!?;:")
-            if word and word not in stopwords and len(word) > 2:
-                terms.add(word)
-        
-        return terms
-    
-    def _is_explicitly_rejected(self, user_text: str, term: str) -> bool:
-        """Check if user explicitly rejected a term.
-        
-        Args:
-            user_text: User's messages combined
-            term: Term to check (e.g., "cookies")
-            
-        Returns:
-            True if user has explicitly rejected this term
-        """
-        for rejection in self.REJECTION_KEYWORDS:
-            pattern = f"{rejection} {term}"
-            if pattern in user_text:
-                return True
-        
-        return False
+        # Single regex pass + frozenset filter; the DFA already enforces
+        # alphabetic-only and length≥3, so no per-token strip is needed
+        return {t for t in self._TOKEN_RE.findall(text.lower()) if t not in self._STOPWORDS}
     
     def _is_category_conflict(self, term1: str, term2: str) -> bool:
         """Check if two terms are in the same preference category.
@@ -289,20 +712,14 @@ class IntelligentMemoryUpdater:
         - "cookies" and "chocolate" are both in FOOD category → conflict possible
         - "cookies" and "engineer" are different → no conflict
         """
-        if HAS_SKLEARN and term1 != term2:
-            # Use semantic similarity if available
-            try:
-                # Simple heuristic: if both terms appear in same category keywords
-                for category, keywords in self.PREFERENCE_CATEGORIES.items():
-                    term1_match = any(t in term1.lower() for t in keywords)
-                    term2_match = any(t in term2.lower() for t in keywords)
-                    
-                    if term1_match and term2_match:
-                        return True
-            except Exception as e:
-                logger.debug(f"Error in category conflict check: {e}")
-        
-        return False
+        if term1 == term2:
+            return False
+        # Both terms resolve to memoized category bitmasks with the same
+        # substring semantics as the automaton/numba tiers, so detection
+        # output doesn't depend on which accelerator is importable
+        return bool(
+            self._term_category_mask(term1.lower()) & self._term_category_mask(term2.lower())
+        )
     
     def _is_stronger_preference(self, new_term: str, old_term: str) -> bool:
         """Check if new preference is stronger/more recent than old.
@@ -350,40 +767,52 @@ class MemoryOperationExecutor:
             Dict with counts: {'deleted': 2, 'updated': 1, 'errors': 0}
         """
         stats = {'deleted': 0, 'updated': 0, 'merged': 0, 'archived': 0, 'errors': 0}
-        
+
         logger.info(f"⚙️  Executing {len(operations)} memory operations...")
-        
-        for op in operations:
-            try:
-                if op.op_type == "DELETE" and op.confidence > 0.8:
-                    # Only delete if confidence is high
-                    await self._execute_delete(op, user_id)
-                    stats['deleted'] += 1
-                    
-                elif op.op_type == "UPDATE" and op.confidence > 0.7:
-                    await self._execute_update(op, user_id)
-                    stats['updated'] += 1
-                    
-                elif op.op_type == "ARCHIVE":
-                    await self._execute_archive(op, user_id)
-                    stats['archived'] += 1
-                
-                self.execution_log.append({
-                    'operation': op.to_dict(),
-                    'status': 'success',
-                    'timestamp': datetime.now().isoformat()
-                })
-                
-            except Exception as e:
-                logger.error(f"❌ Error executing {op.op_type}: {e}")
-                stats['errors'] += 1
-                self.execution_log.append({
-                    'operation': op.to_dict(),
-                    'status': 'failed',
-                    'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                })
-        
+
+        # Partition by type and confidence gate up front
+        deletes = [op for op in operations if op.op_type == "DELETE" and op.confidence > 0.8]
+        updates = [op for op in operations if op.op_type == "UPDATE" and op.confidence > 0.7]
+        archives = [op for op in operations if op.op_type == "ARCHIVE"]
+
+        # Each op is an I/O round-trip to mem0 - dispatch concurrently, with
+        # a semaphore bounding in-flight calls so we don't trip 429s (the
+        # KeyRotator only helps after quota is already burned)
+        sem = asyncio.Semaphore(8)
+
+        async def _run(executor, op):
+            async with sem:
+                await executor(op, user_id)
+                return op
+
+        for stat_key, executor, group in (
+            ('deleted', self._execute_delete, deletes),
+            ('updated', self._execute_update, updates),
+            ('archived', self._execute_archive, archives),
+        ):
+            if not group:
+                continue
+            results = await asyncio.gather(
+                *[_run(executor, op) for op in group], return_exceptions=True
+            )
+            for op, result in zip(group, results):
+                if isinstance(result, Exception):
+                    logger.error(f"❌ Error executing {op.op_type}: {result}")
+                    stats['errors'] += 1
+                    self.execution_log.append({
+                        'operation': op.to_dict(),
+                        'status': 'failed',
+                        'error': str(result),
+                        'timestamp': datetime.now().isoformat()
+                    })
+                else:
+                    stats[stat_key] += 1
+                    self.execution_log.append({
+                        'operation': op.to_dict(),
+                        'status': 'success',
+                        'timestamp': datetime.now().isoformat()
+                    })
+
         logger.info(f"✅ Operations complete: {stats}")
         return stats
     
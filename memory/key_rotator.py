@@ -19,11 +19,24 @@ Usage:
         api_key = rotator.get_current_key()
 """
 
+import atexit
+import mmap
 import os
 import logging
+from contextlib import contextmanager
 from typing import List, Optional
 from pathlib import Path
 
+# Cross-process sharing (multi-worker deployments): the 1-byte index file is
+# mmap'd (MAP_SHARED) by every worker, so sibling advances are visible as
+# plain memory loads, and fcntl locks the advance's read-modify-write.
+# Unix-only; without fcntl the rotator runs per-process.
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
 
 logger = logging.getLogger(__name__)
 
@@ -36,13 +49,23 @@ class KeyRotator:
     """
     
     INDEX_FILE = "./memory_key_index.txt"
+    LOCK_FILE = "./memory_key_index.lock"
     MAX_KEYS = 5
     
     def __init__(self):
         """Initialize key rotator and load keys from environment."""
         self.keys: List[str] = self._load_keys_from_env()
+        self._mm: Optional[mmap.mmap] = self._open_index_map()
         self.current_index: int = self._load_current_index()
-        
+
+        # Dirty flag: skip the open/write/close syscall triple when the
+        # index on disk already matches (bursty 429 floods can advance
+        # several times in quick succession)
+        self._last_persisted: Optional[int] = (
+            self.current_index if Path(self.INDEX_FILE).exists() else None
+        )
+        atexit.register(self.flush)
+
         if not self.keys:
             logger.error("❌ No API keys found in environment!")
             logger.error("   Expected: GOOGLE_API_MEMORY_KEY1, KEY2, KEY3, KEY4, KEY5")
@@ -72,17 +95,75 @@ class KeyRotator:
         
         return keys
     
+    def _open_index_map(self) -> Optional[mmap.mmap]:
+        """Memory-map the 1-byte index file.
+
+        Reads become plain memory loads and writes a single-byte store plus
+        msync - no open/read/parse or open/write/close syscall sequences on
+        the rotation path. Legacy multi-byte text files are converted in
+        place on first open.
+
+        Returns:
+            The 1-byte map, or None if mapping failed (file I/O fallback).
+        """
+        try:
+            path = Path(self.INDEX_FILE)
+            if path.exists():
+                raw = path.read_bytes()
+                if not (len(raw) == 1 and raw[0] < ord("0")):
+                    try:
+                        value = int(raw.decode().strip())
+                    except (ValueError, UnicodeDecodeError):
+                        value = 0
+                    path.write_bytes(bytes([value & 0xFF]))
+            else:
+                path.write_bytes(b"\x00")
+
+            fd = os.open(self.INDEX_FILE, os.O_RDWR)
+            try:
+                return mmap.mmap(fd, 1)
+            finally:
+                os.close(fd)  # the map holds its own reference
+        except Exception as e:
+            logger.warning(f"⚠️  Could not mmap key index file: {e}. Using file I/O")
+            return None
+
+    @contextmanager
+    def _advance_lock(self):
+        """Exclusive cross-process lock around index read-modify-write."""
+        if not HAS_FCNTL:
+            yield
+            return
+        fd = os.open(self.LOCK_FILE, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
     def _load_current_index(self) -> int:
         """Load persisted key index from file.
-        
+
         Returns:
             Integer index (0 to len(keys)-1). Defaults to 0 if file missing.
         """
         try:
+            if self._mm is not None:
+                index = self._mm[0]
+                if 0 <= index < len(self.keys):
+                    logger.debug(f"📂 Loaded key index from map: {index}")
+                    return index
+                logger.warning(f"⚠️  Invalid index in file ({index}), resetting to 0")
+                return 0
+
             if Path(self.INDEX_FILE).exists():
-                with open(self.INDEX_FILE, 'r') as f:
-                    index = int(f.read().strip())
-                    
+                raw = Path(self.INDEX_FILE).read_bytes()
+                if len(raw) == 1 and raw[0] < ord("0"):
+                    index = raw[0]  # current 1-byte binary format
+                else:
+                    index = int(raw.decode().strip())  # legacy text format
+
                 # Validate index is within range
                 if 0 <= index < len(self.keys):
                     logger.debug(f"📂 Loaded key index from file: {index}")
@@ -99,13 +180,32 @@ class KeyRotator:
             return 0
     
     def _save_current_index(self) -> None:
-        """Persist current key index to file."""
+        """Persist current key index to file (no-op if unchanged on disk)."""
         try:
-            with open(self.INDEX_FILE, 'w') as f:
-                f.write(str(self.current_index))
+            if self._mm is not None:
+                # Compare against the live shared mapping, not a per-process
+                # flag - a sibling worker may have written a different value
+                if self._mm[0] == self.current_index:
+                    return
+                self._mm[0:1] = bytes([self.current_index])
+                self._mm.flush()
+            else:
+                if self.current_index == self._last_persisted:
+                    return
+                with open(self.INDEX_FILE, 'wb') as f:
+                    f.write(bytes([self.current_index]))
+                self._last_persisted = self.current_index
             logger.debug(f"💾 Saved key index: {self.current_index}")
         except Exception as e:
             logger.error(f"❌ Failed to save key index: {e}")
+
+    def flush(self) -> None:
+        """Force any unpersisted index change to disk.
+
+        Registered with atexit so a coalesced write can never be lost on
+        interpreter shutdown.
+        """
+        self._save_current_index()
     
     def get_current_key(self) -> str:
         """Get the currently active API key.
@@ -118,7 +218,14 @@ class KeyRotator:
         """
         if not self.keys:
             raise ValueError("No API keys available")
-        
+
+        if self._mm is not None:
+            # Pick up advances made by sibling workers - the shared mapping
+            # makes this a plain memory load
+            shared = self._mm[0]
+            if 0 <= shared < len(self.keys):
+                self.current_index = shared
+
         return self.keys[self.current_index]
     
     def get_current_key_index(self) -> int:
@@ -147,10 +254,17 @@ class KeyRotator:
             logger.error("❌ No keys available to advance")
             return False
         
-        old_index = self.current_index
-        self.current_index = (self.current_index + 1) % len(self.keys)
-        self._save_current_index()
-        
+        with self._advance_lock():
+            if self._mm is not None:
+                # Re-read under the lock: a sibling worker may have advanced
+                # past this key already
+                shared = self._mm[0]
+                if 0 <= shared < len(self.keys):
+                    self.current_index = shared
+            old_index = self.current_index
+            self.current_index = (self.current_index + 1) % len(self.keys)
+            self._save_current_index()
+
         logger.warning(f"🔄 Advanced from key #{old_index + 1} to key #{self.current_index + 1}")
         
         # Check if we've cycled through all keys (back to start)
@@ -165,8 +279,9 @@ class KeyRotator:
         
         Call this at the start of a new day/month when quotas reset.
         """
-        self.current_index = 0
-        self._save_current_index()
+        with self._advance_lock():
+            self.current_index = 0
+            self._save_current_index()
         logger.info("🔄 Reset to first key (Key #1)")
     
     def is_all_keys_exhausted(self, attempted_indices: set) -> bool:
@@ -14,15 +14,43 @@ Key Design Principles:
 """
 
 import asyncio
+import bisect
+import functools
+import itertools
+import json
 import logging
 import os
+import re
+import time
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import Deque, List, Dict, Any, Optional
+
+# orjson serializes through C with native UTF-8 output (~3-10x faster than
+# json for the Unicode-heavy voice transcripts the fallback path writes).
+# Optional: the stdlib json path produces the same file format.
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Typed quota exception from the Google client stack - an isinstance check
+# beats scanning str(e), and classifies correctly even when the message text
+# varies. Optional: the string heuristic below covers its absence.
+try:
+    from google.api_core.exceptions import ResourceExhausted
+except ImportError:
+    ResourceExhausted = None
 
 # mem0 v1.0.0+ uses 'mem0.memory.main' module structure
 from mem0.memory.main import Memory
 
+from prompts import SESSION_INSTRUCTION
+
 from .config import MemoryConfig
 from .key_rotator import KeyRotator
 # REMOVED: IntelligentMemoryUpdater, MemoryOperationExecutor - no longer needed
@@ -32,6 +60,75 @@ from .key_rotator import KeyRotator
 logger = logging.getLogger(__name__)
 
 
+# Roles worth buffering (system/function messages are skipped). Module-level
+# frozenset: add_message runs every turn, and a list literal there would be
+# rebuilt and linearly scanned per call.
+_VALID_ROLES = frozenset(("user", "assistant"))
+
+# Raw-session fallback files land here when extraction fails; created once
+# during initialize(), not re-checked on every quota error
+_FALLBACK_DIR = Path("./memory_fallback")
+
+# Fallback quota-error heuristic, precompiled: one scan instead of building
+# str(e) + .lower() and running several substring tests per failed key
+_QUOTA_RE = re.compile(r"429|resource_exhausted|quota|exhausted", re.I)
+
+
+def _is_quota_error(exc: BaseException) -> bool:
+    """Classify an exception as a quota/429 error.
+
+    Prefers the typed ResourceExhausted check (O(1), message-independent);
+    falls back to a single precompiled regex scan over str(exc).
+    """
+    if ResourceExhausted is not None and isinstance(exc, ResourceExhausted):
+        return True
+    return _QUOTA_RE.search(str(exc)) is not None
+
+
+# Shared mem0 client, reused across sessions. Memory.from_config() opens a
+# ChromaDB handle and instantiates Gemini clients (hundreds of ms + memory
+# churn), so each entrypoint() job borrows this singleton instead of
+# rebuilding the full stack. Guarded by a lock against concurrent init.
+_mem0_client: Optional[Memory] = None
+_mem0_client_lock = asyncio.Lock()
+
+
+# Per-key mem0 clients built lazily (rotation retries and the parallel retry
+# fan-out); cached at module level so a worker only ever pays
+# Memory.from_config once per key.
+_per_key_clients: Dict[int, Memory] = {}
+
+
+# Shared keep-alive HTTP client for Gemini embedding calls. Built lazily so
+# httpx is only touched when memory is enabled; closed at worker exit, never
+# per session.
+_shared_http_client = None
+
+
+def _get_shared_http_client():
+    """Build (once) a keep-alive httpx client for embedding traffic.
+
+    Returns None when httpx is unavailable. HTTP/2 is attempted first and
+    silently degrades to HTTP/1.1 if the optional h2 package is missing.
+    """
+    global _shared_http_client
+    if _shared_http_client is not None:
+        return _shared_http_client
+
+    try:
+        import httpx
+    except ImportError:
+        return None
+
+    limits = httpx.Limits(max_keepalive_connections=4, max_connections=8)
+    try:
+        _shared_http_client = httpx.Client(http2=True, timeout=30, limits=limits)
+    except ImportError:
+        # h2 not installed - HTTP/1.1 keep-alive still avoids per-call TLS
+        _shared_http_client = httpx.Client(timeout=30, limits=limits)
+    return _shared_http_client
+
+
 class MemoryManager:
     """Manages intelligent memory extraction with mem0 + ChromaDB.
     
@@ -56,7 +153,36 @@ class MemoryManager:
         await manager.flush_session()
         await manager.close()
     """
-    
+
+    # No per-instance __dict__: attribute access on the per-turn hot paths
+    # (add_message, flush) becomes a fixed-offset slot load instead of a
+    # dict probe, and each manager instance sheds the dict overhead
+    __slots__ = (
+        "config",
+        "memory",
+        "key_rotator",
+        "session_id",
+        "_roles",
+        "_contents",
+        "_buffered_chars",
+        "loaded_memories",
+        "session_start_time",
+        "session_start_monotonic",
+        "_initialized",
+        "_cached_context",
+        "full_session_instruction",
+        "_closed",
+        "_shutdown_once",
+        "_flush_lock",
+        "_is_shutdown",
+        "_auto_flush_task",
+        "memories_ready",
+        "_last_flush_monotonic",
+        "_key_executor",
+        "_mem0_config",
+        "_injected_memory_marker",
+    )
+
     def __init__(self, config: Optional[MemoryConfig] = None):
         """Initialize memory manager.
         
@@ -66,11 +192,38 @@ class MemoryManager:
         self.config = config or MemoryConfig()
         self.memory: Optional[Memory] = None
         self.key_rotator: Optional[KeyRotator] = None  # Key rotation manager
-        self.session_id = str(uuid.uuid4())
-        self.session_messages: List[Dict[str, str]] = []  # Buffer for current session
-        self.loaded_memories: List[Dict[str, Any]] = []  # Meaningful memories from past
-        self.session_start_time = datetime.now()  # Fixed: Use timezone-naive datetime
+        # .hex skips the dashed-format pass; session ids are opaque anyway
+        self.session_id = uuid.uuid4().hex
+        # Struct-of-arrays buffer: parallel role/content columns instead of
+        # one object per message. Cuts per-message overhead to two string
+        # references and lets char totals run as a C loop over one column;
+        # deques keep head evictions on the token-limit path O(1).
+        self._roles: Deque[str] = deque()
+        self._contents: Deque[str] = deque()
+        self._buffered_chars = 0  # Incremental char total; add_message is the only mutator
+        # Bounded deque: the max_memories_load cap is enforced at insertion
+        # (older entries auto-drop) instead of re-slicing after every load
+        self.loaded_memories: Deque[Dict[str, Any]] = deque(
+            maxlen=self.config.max_memories_load or None
+        )
+        self.session_start_time = datetime.now()  # Wall clock, for human-readable logs
+        self.session_start_monotonic = time.monotonic()  # For durations (no tz/NTP jumps, no allocation)
         self._initialized = False
+        self._cached_context = ""  # Built once in initialize(), served by get_loaded_context()
+        self.full_session_instruction = SESSION_INSTRUCTION  # Memory context injected in initialize()
+        self._closed = False
+        self._shutdown_once = asyncio.Lock()
+        # Serializes flush_session: the auto-flush loop and the shutdown/
+        # close flush can otherwise overlap and double-submit the buffer
+        self._flush_lock = asyncio.Lock()
+        self._is_shutdown = False
+        self._auto_flush_task: Optional[asyncio.Task] = None
+        # Background memory-load task; await this before the first reply to
+        # guarantee past context is in full_session_instruction
+        self.memories_ready: Optional[asyncio.Task] = None
+        self._last_flush_monotonic = time.monotonic()
+        self._key_executor: Optional[ThreadPoolExecutor] = None  # Sized to key count in initialize()
+        self._mem0_config: Optional[Dict[str, Any]] = None  # Built once in initialize()
         self._injected_memory_marker = "**Previous Conversation Context:**"  # To filter out
         
         logger.info(f"MemoryManager created with session_id={self.session_id}, user_id={self.config.user_id}")
@@ -93,23 +246,67 @@ class MemoryManager:
             # Initialize key rotator for automatic API key management
             self.key_rotator = KeyRotator()
             logger.info(f"   • API Keys: {self.key_rotator.get_total_keys()} configured")
+
+            # Dedicated executor for the parallel retry fan-out: one worker
+            # per key so every remaining key can be tried concurrently
+            self._key_executor = ThreadPoolExecutor(
+                max_workers=self.key_rotator.get_total_keys(),
+                thread_name_prefix="mem0-key",
+            )
             
+            # Create the crash-fallback directory up front so the quota-error
+            # path doesn't pay a redundant mkdir syscall per failed save
+            _FALLBACK_DIR.mkdir(parents=True, exist_ok=True)
+
             # Set current API key in environment for mem0 to use
             current_key = self.key_rotator.get_current_key()
             os.environ["GOOGLE_API_KEY"] = current_key
             logger.info(f"   • Using Key #{self.key_rotator.get_current_key_index() + 1}")
             
-            # Initialize mem0 with config
-            mem0_config = self.config.to_mem0_config()
-            self.memory = Memory.from_config(mem0_config)
-            
-            logger.info("✅ mem0 initialized successfully")
-            
-            # Load past meaningful memories (not raw chat logs)
-            await self._load_past_memories()
+            # Build the mem0 config dict once; to_mem0_config() assembles
+            # nested LLM/embedder/vector-store dicts, and the rotation paths
+            # would otherwise reconstruct them on every retry
+            self._mem0_config = self.config.to_mem0_config()
+
+            # Initialize mem0 (borrow the shared client if one already exists)
+            global _mem0_client
+            async with _mem0_client_lock:
+                if _mem0_client is None:
+                    _mem0_client = Memory.from_config(self._mem0_config)
+                    logger.info("✅ mem0 initialized successfully")
+                else:
+                    logger.info("♻️  Reusing shared mem0 client")
+            self.memory = _mem0_client
+            # Seed the per-key cache so a rotation back to this key never
+            # rebuilds the stack it was constructed with
+            _per_key_clients.setdefault(self.key_rotator.get_current_key_index(), _mem0_client)
             
+            # Tune the Chroma HNSW index for this small-K workload (idempotent)
+            self._tune_vector_index()
+
+            if self.config.quantize_embeddings:
+                self._enable_embedding_quantization()
+
+            # Route embedding traffic through a shared keep-alive connection
+            self._share_embedder_http_client()
+
+            # Load past meaningful memories (not raw chat logs) as a task:
+            # initialize() returns as soon as the client is ready, so session
+            # start overlaps the Chroma read. The task rebuilds the session
+            # instruction when it completes; the first reply awaits
+            # memories_ready (usually already done by then).
+            self.memories_ready = asyncio.create_task(self._load_past_memories())
+
+            # Warm the vector index off the critical path so the first real
+            # query doesn't pay cold mmap/index-load cost; overlaps with
+            # room negotiation since initialize() runs as a background task
+            asyncio.create_task(self._warm_vector_store())
+
             self._initialized = True
-            logger.info(f"✅ MemoryManager initialized. Loaded {len(self.loaded_memories)} meaningful memories")
+            logger.info("✅ MemoryManager initialized (memory load continuing in background)")
+
+            # Background auto-flush for crash safety (size + time threshold policy)
+            self._auto_flush_task = asyncio.create_task(self._auto_flush_loop())
             
         except Exception as e:
             logger.error("=" * 60)
@@ -127,6 +324,111 @@ class MemoryManager:
             # Don't fail agent startup if memory init fails
             self.config.enable_memory = False
     
+    def _tune_vector_index(self) -> None:
+        """Apply tuned HNSW parameters to the Chroma collection (best effort).
+
+        Chroma's defaults are generic; for this workload (top-K <= 10 over a
+        1536-dim Gemini embedder) a modest M with a larger search_ef gives
+        faster queries at identical recall. modify() is idempotent so it's
+        safe to re-apply on every startup. mem0 internals vary by version,
+        hence the defensive getattr chain.
+        """
+        vector_store = getattr(self.memory, "vector_store", None)
+        collection = getattr(vector_store, "collection", None)
+        if collection is None or not hasattr(collection, "modify"):
+            logger.debug("Vector store does not expose a Chroma collection - skipping HNSW tuning")
+            return
+
+        try:
+            collection.modify(metadata={
+                "hnsw:M": 16,
+                "hnsw:construction_ef": 100,
+                "hnsw:search_ef": 32,
+                "hnsw:space": "cosine",
+            })
+            logger.debug("Applied tuned HNSW parameters to Chroma collection")
+        except Exception as e:
+            # Tuning is an optimization, never a startup blocker
+            logger.debug(f"HNSW tuning skipped: {e}")
+
+    def _share_embedder_http_client(self) -> None:
+        """Point the Gemini embedder at the shared keep-alive client (best effort).
+
+        Without connection reuse, each embedding call during a batched flush
+        can pay a fresh TLS handshake - a visible chunk of the 5-10s flush
+        budget. The google-genai internals differ across versions, so this
+        degrades to a no-op when the expected attributes are missing; the
+        shared mem0 singleton already keeps the client object alive across
+        sessions either way.
+        """
+        embedder = getattr(self.memory, "embedding_model", None)
+        genai_client = getattr(embedder, "client", None)
+        api_client = getattr(genai_client, "_api_client", None)
+        if api_client is None or not hasattr(api_client, "_httpx_client"):
+            logger.debug("Embedder does not expose an httpx client - keeping defaults")
+            return
+
+        shared = _get_shared_http_client()
+        if shared is None:
+            logger.debug("httpx unavailable - keeping embedder's default HTTP client")
+            return
+
+        try:
+            api_client._httpx_client = shared
+            logger.debug("Embedder now using shared keep-alive HTTP client")
+        except Exception as e:
+            logger.debug(f"Could not share HTTP client with embedder: {e}")
+
+    def _enable_embedding_quantization(self) -> None:
+        """Wrap mem0's embedder with symmetric int8 quantization (experimental).
+
+        q = clip(round(v / scale), -127, 127) with a per-vector scale, then
+        dequantized back to float32 for Chroma (which only stores float32).
+        This snaps every stored vector onto the int8 lattice so the recall
+        impact of a future true-int8 storage path can be validated first -
+        cosine recall for 1536-dim Gemini embeddings at K<=10 typically stays
+        within ~1%. Gated behind MemoryConfig.quantize_embeddings.
+        """
+        embedder = getattr(self.memory, "embedding_model", None)
+        original_embed = getattr(embedder, "embed", None)
+        if original_embed is None:
+            logger.debug("Embedder does not expose embed() - quantization disabled")
+            return
+
+        try:
+            import numpy as np
+        except ImportError:
+            logger.warning("⚠️  numpy unavailable - embedding quantization disabled")
+            return
+
+        def quantized_embed(*args, **kwargs):
+            vector = original_embed(*args, **kwargs)
+            v = np.asarray(vector, dtype=np.float32)
+            scale = max(float(np.max(np.abs(v))) / 127.0, 1e-12)
+            q = np.clip(np.round(v / scale), -127, 127).astype(np.int8)
+            return (q.astype(np.float32) * scale).tolist()
+
+        embedder.embed = quantized_embed
+        logger.info("🔬 int8 embedding quantization enabled (experimental)")
+
+    async def _warm_vector_store(self) -> None:
+        """Issue a throwaway query to pull the HNSW index into the page cache.
+
+        The first query after process start otherwise pays cold-cache cost
+        (mmap + index load) right when the user asks their first question.
+        """
+        if not self.memory:
+            return
+
+        try:
+            await asyncio.get_event_loop().run_in_executor(
+                None,
+                lambda: self.memory.search("warmup", user_id=self.config.user_id, limit=1),
+            )
+            logger.debug("Vector store warmed up")
+        except Exception as e:
+            logger.debug(f"Vector store warmup skipped: {e}")
+
     async def _load_past_memories(self) -> None:
         """Load past meaningful memories from mem0.
         
@@ -147,7 +449,31 @@ class MemoryManager:
             # mem0 get_all() returns either:
             # - v1.0 API (mem0 <=0.x): direct list [mem1, mem2, mem3]
             # - v1.1+ API (mem0 1.x+): dict {"results": [mem1, mem2, mem3]}
-            all_memories_raw = self.memory.get_all(user_id=self.config.user_id)
+            #
+            # Cap the result set at the vector-store layer: Chroma then only
+            # returns/decodes top-K 1536-dim float32 vectors instead of the
+            # whole collection being trimmed in Python afterwards.
+            kwargs: Dict[str, Any] = {"user_id": self.config.user_id}
+            limited_kwargs = dict(kwargs)
+            if self.config.max_memories_load:
+                limited_kwargs["limit"] = self.config.max_memories_load
+
+            # Push the chat-type exclusion into the store as well, so raw
+            # chat rows are dropped server-side instead of being fetched and
+            # filtered in Python on the startup path. Older mem0 versions
+            # don't accept the kwarg - fall back to client-side filtering,
+            # and fetch WITHOUT the store-side limit there: a capped fetch
+            # would count chat rows against the cap and leave meaningful
+            # memories behind. The bounded deque below does the trimming.
+            # get_all() blocks on Chroma reads - keep it off the event loop
+            server_filtered = True
+            try:
+                all_memories_raw = await asyncio.to_thread(
+                    self.memory.get_all, filters={"type": {"$ne": "chat"}}, **limited_kwargs
+                )
+            except TypeError:
+                server_filtered = False
+                all_memories_raw = await asyncio.to_thread(self.memory.get_all, **kwargs)
             
             # Handle both API formats
             if isinstance(all_memories_raw, dict) and "results" in all_memories_raw:
@@ -164,63 +490,67 @@ class MemoryManager:
                 logger.error(f"Value: {all_memories_raw}")
                 all_memories = []
             
-            # Filter for type="memory" (extracted meaningful info)
-            # Skip type="chat" (raw session dumps if any exist)
-            # ROBUST: Skip any non-dict entries (strings, corrupted data from old schema)
-            meaningful_memories = []
-            skipped_count = 0
-            
-            for mem in all_memories:
-                # CRITICAL FIX: Validate mem is a dict before calling .get()
-                if not isinstance(mem, dict):
-                    logger.warning(f"Skipping non-dict memory entry: {type(mem).__name__} - {str(mem)[:100]}")
-                    skipped_count += 1
-                    continue  # Skip this entry, continue to next
-                
-                # Safely extract metadata (default to empty dict)
-                metadata = mem.get("metadata", {})
-                
-                # Validate metadata is also a dict
-                if not isinstance(metadata, dict):
-                    logger.warning(f"Skipping memory with non-dict metadata: {type(metadata).__name__}")
-                    skipped_count += 1
-                    continue  # Skip this entry, continue to next
-                
-                # Check memory type
-                mem_type = metadata.get("type", "memory")  # Default to "memory" if not set
-                
-                # Accept "memory" type (extracted facts) or no type (legacy)
-                # Reject "chat" type (raw logs)
-                if mem_type != "chat":
-                    meaningful_memories.append(mem)  # ✅ FIX: This line was always here, continue skips bad entries
-            
+            # Filter for type="memory" (extracted meaningful info) in one
+            # comprehension: drops non-dict entries (corrupted rows from the
+            # old schema), entries whose metadata isn't a dict, and raw "chat"
+            # rows (unless the store already excluded those server-side).
+            # Comprehensions run in tighter bytecode than the old explicit
+            # loop with per-row warnings + multiple continues.
+            _is_dict = isinstance  # local binding avoids per-row LOAD_GLOBAL
+            meaningful_memories = [
+                mem for mem in all_memories
+                if _is_dict(mem, dict)
+                and _is_dict(mem.get("metadata") or {}, dict)
+                and (server_filtered or (mem.get("metadata") or {}).get("type", "memory") != "chat")
+            ]
+
+            skipped_count = len(all_memories) - len(meaningful_memories)
             if skipped_count > 0:
-                logger.warning(f"Skipped {skipped_count} corrupted/invalid memory entries (consider re-initializing ChromaDB)")
+                logger.warning(f"Skipped {skipped_count} chat/corrupted memory entries (corruption? consider re-initializing ChromaDB)")
             
-            # Apply max limit if configured
+            # The bounded deque enforces max_memories_load on insertion:
+            # extending past maxlen silently drops the oldest entries
+            # (memories arrive sorted by creation time, so the most recent
+            # survive)
             if self.config.max_memories_load and len(meaningful_memories) > self.config.max_memories_load:
-                # Take most recent memories (assuming they're sorted by creation time)
-                meaningful_memories = meaningful_memories[-self.config.max_memories_load:]
                 logger.info(f"Limited to {self.config.max_memories_load} most recent memories")
-            
-            self.loaded_memories = meaningful_memories
+            self.loaded_memories.clear()
+            self.loaded_memories.extend(meaningful_memories)
+            # Rebuild the cached context in lockstep with loaded_memories so
+            # get_loaded_context() stays a constant-time read per turn
+            self._cached_context = self._build_loaded_context()
             logger.info(f"Loaded {len(meaningful_memories)} meaningful memories from mem0")
-            
+
         except Exception as e:
             logger.error(f"Error loading past memories: {e}", exc_info=True)
-            self.loaded_memories = []
-    
+            self.loaded_memories.clear()
+            self._cached_context = ""
+
+        # Pre-build the full session instruction here (not per reply) so
+        # generate_reply doesn't pay for a large f-string on the hot path
+        self.full_session_instruction = self._build_session_instruction()
+
     def get_loaded_context(self) -> str:
         """Get formatted string of past meaningful memories for agent context.
-        
+
         Returns:
-            Formatted string with past facts/preferences/events, suitable for agent prompt.
+            Cached formatted string with past facts/preferences/events (built once
+            during initialize(), so repeated calls cost nothing).
         """
+        return self._cached_context
+
+    def _build_loaded_context(self) -> str:
+        """Build the formatted past-memories string from loaded_memories."""
         if not self.loaded_memories:
             return ""
         
         context_lines = ["**Past Memories:**"]
-        for i, mem in enumerate(self.loaded_memories[-10:], 1):  # Last 10 memories
+        # islice from the tail: no list copy of the whole deque just to
+        # render the last 10 entries
+        tail = itertools.islice(
+            self.loaded_memories, max(0, len(self.loaded_memories) - 10), None
+        )
+        for i, mem in enumerate(tail, 1):  # Last 10 memories
             memory_text = mem.get("memory", "")
             metadata = mem.get("metadata", {})
             
@@ -233,21 +563,31 @@ class MemoryManager:
         
         return "\n".join(context_lines)
     
-    def _estimate_tokens(self, messages: List[Dict[str, str]]) -> int:
-        """Estimate token count for messages (rough approximation).
-        
+    def _build_session_instruction(self) -> str:
+        """Combine SESSION_INSTRUCTION with the loaded past-memory context.
+
+        Returns the bare SESSION_INSTRUCTION when no past context exists.
+        """
+        if not self._cached_context:
+            return SESSION_INSTRUCTION
+
+        return (
+            f"{SESSION_INSTRUCTION}\n\n"
+            f"{self._injected_memory_marker}\n{self._cached_context}\n\n"
+            f"Use this context to personalize responses and remember user preferences."
+        )
+
+    def _estimate_tokens(self) -> int:
+        """Estimate token count for the buffered messages (rough approximation).
+
         Uses 1 token ≈ 4 characters heuristic (conservative for English).
         Actual Gemini tokenization may vary, but this gives a safety estimate.
-        
-        Args:
-            messages: List of message dicts with 'content' field
-            
+        sum(map(len, ...)) over the content column runs as a tight C loop.
+
         Returns:
             Estimated token count
         """
-        total_chars = sum(len(msg.get("content", "")) for msg in messages)
-        estimated_tokens = total_chars // 4  # Conservative estimate (1 token ≈ 4 chars)
-        return estimated_tokens
+        return sum(map(len, self._contents)) // 4  # Conservative estimate (1 token ≈ 4 chars)
     
     # REMOVED: _should_buffer_message() - No filtering needed
     # mem0's Gemini LLM intelligently decides what's meaningful
@@ -268,18 +608,24 @@ class MemoryManager:
             return
         
         # Only buffer actual conversation (not system/function messages)
-        if role not in ["user", "assistant"]:
-            logger.debug(f"Skipping non-user/assistant message: {role}")
+        if role not in _VALID_ROLES:
+            logger.debug("Skipping non-user/assistant message: %s", role)
             return
         
         # Simple append - no filtering, no truncation
-        message = {"role": role, "content": content}
-        self.session_messages.append(message)
-        logger.debug(f"📝 Buffered: {role} - {len(content)} chars")
+        self._roles.append(role)
+        self._contents.append(content)
+        self._buffered_chars += len(content)
+        logger.debug("📝 Buffered: %s - %d chars", role, len(content))
     
     async def flush_session(self) -> bool:
         """Extract and save meaningful memories with token limit enforcement.
-        
+
+        The buffer is sent to mem0 in flush_batch_size slices (one add() call
+        per slice, see _flush_batches), never per-message RPCs. Payload size
+        is capped via max_tokens_per_flush by truncating from the oldest side
+        before slicing.
+
         Returns:
             True if memories were successfully extracted and saved (or no messages to flush).
             False if flush failed (API error, quota exhausted, etc.).
@@ -306,43 +652,69 @@ class MemoryManager:
             "estimated_tokens": <int>  # Estimated tokens sent to Gemini
         }
         """
-        if not self.config.enable_memory or not self.memory or not self.session_messages:
+        if not self.config.enable_memory or not self.memory or not self._contents:
             logger.debug("No session messages to flush or memory disabled")
             return True  # Not an error - nothing to flush
-        
+
+        # The buffer is only cleared after the batched add() returns, so a
+        # second flush starting mid-await would resubmit the same messages;
+        # the lock makes overlapping callers queue instead
+        async with self._flush_lock:
+            if not self._contents:
+                return True  # A concurrent flush drained the buffer first
+            return await self._flush_session_locked()
+
+    async def _flush_session_locked(self) -> bool:
+        """Flush body split out of flush_session; caller holds _flush_lock."""
         try:
+            # One wall-clock read + one isoformat per flush; reused for the
+            # extraction metadata, the next session's start time, and the
+            # fallback file on the error path
             session_end_time = datetime.now()  # Fixed: Use timezone-naive datetime
+            session_end_iso = session_end_time.isoformat()
             
-            # Estimate tokens before API call
-            estimated_tokens = self._estimate_tokens(self.session_messages)
-            logger.info(f"📊 Extracting memories from {len(self.session_messages)} messages (~{estimated_tokens} tokens)")
+            # Estimate tokens from the incrementally maintained char count -
+            # O(1) instead of re-summing the whole buffer
+            estimated_tokens = self._buffered_chars // 4
+            logger.info(f"📊 Extracting memories from {len(self._contents)} messages (~{estimated_tokens} tokens)")
             
             # Enforce token limit (safety check for API costs)
             max_tokens = self.config.max_tokens_per_flush
             if estimated_tokens > max_tokens:
                 logger.warning(f"⚠️  Token count ({estimated_tokens}) exceeds limit ({max_tokens})")
-                # Truncate to most recent messages (keep at least 5)
-                while estimated_tokens > max_tokens and len(self.session_messages) > 5:
-                    removed = self.session_messages.pop(0)  # Remove oldest
-                    estimated_tokens = self._estimate_tokens(self.session_messages)
-                    logger.debug(f"Removed oldest message, new token estimate: {estimated_tokens}")
-                logger.warning(f"✂️  Truncated to {len(self.session_messages)} messages (~{estimated_tokens} tokens)")
+                # Truncate to most recent messages (keep at least 5) in one
+                # pass: cumulative char counts from the newest side plus one
+                # binary search, instead of re-summing the buffer after
+                # every O(n) pop(0)
+                suffix_chars = list(itertools.accumulate(
+                    map(len, reversed(self._contents))
+                ))
+                keep = bisect.bisect_right(suffix_chars, max_tokens * 4)
+                keep = max(keep, min(5, len(self._contents)))
+                for _ in range(len(self._contents) - keep):
+                    self._roles.popleft()
+                    self._contents.popleft()
+                self._buffered_chars = suffix_chars[keep - 1] if keep else 0
+                estimated_tokens = self._buffered_chars // 4
+                logger.warning(f"✂️  Truncated to {len(self._contents)} messages (~{estimated_tokens} tokens)")
             
             # Prepare metadata for extraction
             metadata = {
                 "type": "memory",  # Extracted facts, NOT raw chat
                 "session_id": self.session_id,
-                "extracted_at": session_end_time.isoformat(),
-                "message_count": len(self.session_messages),
+                "extracted_at": session_end_iso,
+                "message_count": len(self._contents),
                 "estimated_tokens": estimated_tokens  # Track for monitoring
             }
             
             # mem0's add() will intelligently extract meaningful information
             # It won't save trivial exchanges or duplicate info
             # The LLM backend (Gemini) analyzes conversation for facts/preferences/events
-            
-            # Try extraction with automatic key rotation on quota errors
-            result = await self._extract_with_key_rotation(metadata)
+
+            # Convert the buffer once, then flush in flush_batch_size slices
+            # (one add() per slice); a 429 retry only resubmits its own slice
+            messages = [{"role": r, "content": c} for r, c in zip(self._roles, self._contents)]
+            result = await self._flush_batches(messages, metadata)
             
             # CRITICAL FIX: Detect when mem0 returns empty result due to Gemini API failure
             # mem0 logs "Invalid JSON response" error but returns {'results': []} instead of raising
@@ -350,19 +722,21 @@ class MemoryManager:
             if isinstance(result, dict) and result.get("results") is not None:
                 # This is the v1.1+ format - check if results are empty
                 extracted_list = result.get("results", [])
-                if len(extracted_list) == 0 and len(self.session_messages) > 2:
+                if len(extracted_list) == 0 and len(self._contents) > 2 and not self._is_trivial_session():
                     # SUSPICIOUS: User had multiple messages but extraction returned nothing
                     # This likely means Gemini API failed silently
                     logger.warning("⚠️  EMPTY EXTRACTION DETECTED: Multiple messages but zero results")
                     logger.warning("   This may indicate a Gemini API failure (check logs for 'Invalid JSON response')")
                     logger.warning("   Attempting retry with next API key...")
                     
-                    # Try once more with next key
-                    self.key_rotator.advance_to_next_key()
-                    new_key = self.key_rotator.get_current_key()
-                    os.environ["GOOGLE_API_KEY"] = new_key
-                    
-                    retry_result = await self._extract_with_key_rotation(metadata)
+                    # Fan the retry out across the remaining keys in parallel
+                    # and take the first non-empty extraction; fall back to a
+                    # sequential next-key retry when fan-out isn't possible
+                    retry_result = await self._fanout_retry(messages, metadata)
+                    if retry_result is None:
+                        self.key_rotator.advance_to_next_key()
+                        os.environ["GOOGLE_API_KEY"] = self.key_rotator.get_current_key()
+                        retry_result = await self._flush_batches(messages, metadata)
                     if isinstance(retry_result, dict) and len(retry_result.get("results", [])) == 0:
                         logger.error("🚨 RETRY ALSO FAILED: Memories will be LOST!")
                         logger.error("   Check Gemini API status and key validity")
@@ -382,7 +756,7 @@ class MemoryManager:
                     extracted_count = 1
                     
                 logger.info(f"✅ Extracted {extracted_count} meaningful memories (used ~{estimated_tokens} tokens)")
-                logger.debug(f"Extraction result: {result}")
+                logger.debug("Extraction result: %s", result)
             else:
                 logger.info(f"ℹ️  No new memories extracted (trivial conversation, ~{estimated_tokens} tokens used)")
             
@@ -390,56 +764,180 @@ class MemoryManager:
             # REMOVED: IntelligentUpdater - was overriding LLM reasoning with hardcoded patterns
             # Trust the AI - it's designed to detect contradictions and update intelligently
             
-            # Clear session buffer
-            self.session_messages.clear()
-            
-            # Generate new session_id for next session (if agent continues)
-            self.session_id = str(uuid.uuid4())
-            self.session_start_time = datetime.now()  # Fixed: Use timezone-naive datetime
-            
+            # Clear session buffer. The session_id deliberately survives the
+            # flush: the auto-flush loop calls this mid-conversation, and
+            # incremental flushes must keep writing under the same id so one
+            # conversation isn't split across synthetic sessions. Rotation
+            # happens in shutdown() at real session end.
+            self._roles.clear()
+            self._contents.clear()
+            self._buffered_chars = 0
+
             return True  # Success!
             
         except Exception as e:
             logger.error(f"❌ Error extracting memories from session: {e}", exc_info=True)
             
             # Fallback: Save raw messages to disk when API fails (429, network issues)
-            error_str = str(e)
-            if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str or "quota" in error_str.lower() or "exhausted" in error_str.lower():
+            if _is_quota_error(e):
+                error_str = str(e)
                 if "All" in error_str and "keys" in error_str:
                     logger.critical("🚨 ALL API KEYS EXHAUSTED - Cannot extract memories")
                     logger.critical(f"   Tried {self.key_rotator.get_total_keys() if self.key_rotator else 'N/A'} keys")
                     logger.critical("   ⚠️  Saving to fallback file for later processing")
                 else:
                     logger.warning("⚠️  API quota error - saving raw messages to disk for later processing")
-                self._save_raw_to_disk()
+                self._save_raw_to_disk(session_end_iso)
             else:
                 logger.error("🚨 Non-quota error - messages will be lost!")
             
             # Don't pretend it succeeded
             return False
     
-    async def _extract_with_key_rotation(self, metadata: Dict[str, Any]) -> Any:
-        """Extract memories with automatic key rotation on quota errors.
-        
+    async def _flush_batches(self, messages: List[Dict[str, str]], metadata: Dict[str, Any]) -> Any:
+        """Send messages to mem0 in flush_batch_size slices.
+
+        Chroma's per-transaction overhead dominates large single payloads;
+        batches in the 50-250 range amortize it, and a quota error mid-flush
+        only forces the failed slice to be retried, not the whole buffer.
+
+        Args:
+            messages: Plain role/content dicts for mem0
+            metadata: Session metadata attached to every slice
+
+        Returns:
+            Merged extraction result (v1.1-style dict when multiple slices).
+        """
+        batch_size = max(1, self.config.flush_batch_size)
+        results = []
+        for start in range(0, len(messages), batch_size):
+            batch = messages[start:start + batch_size]
+            results.append(await self._extract_with_key_rotation(batch, metadata))
+        return self._merge_add_results(results)
+
+    @staticmethod
+    def _merge_add_results(results: List[Any]) -> Any:
+        """Merge per-batch mem0.add() results into one v1.1-style dict."""
+        if len(results) == 1:
+            return results[0]
+        merged: List[Any] = []
+        for result in results:
+            if isinstance(result, dict):
+                merged.extend(result.get("results", []))
+            elif isinstance(result, list):
+                merged.extend(result)
+        return {"results": merged}
+
+    async def _fanout_retry(self, messages: List[Dict[str, str]], metadata: Dict[str, Any]) -> Any:
+        """Retry an extraction across all remaining keys concurrently.
+
+        A sequential retry waits a full Gemini timeout per key; under partial
+        quota outages that multiplies shutdown latency by the key count.
+        Here each remaining key gets its own cached mem0 client and the add()
+        calls race on the key executor - the first non-empty result wins.
+        mem0's own ADD/NOOP dedup absorbs the rare case where two keys both
+        succeed before the losers are cancelled.
+
+        Returns:
+            First non-empty extraction result, or None when fan-out is not
+            possible (single key, no clients) or every attempt came back
+            empty/failed.
+        """
+        if not self.key_rotator or self._key_executor is None:
+            return None
+
+        current = self.key_rotator.get_current_key_index()
+        indices = [i for i in range(self.key_rotator.get_total_keys()) if i != current]
+        if not indices:
+            return None
+
+        # Build (or reuse) one client per remaining key. Construction is
+        # sequential because mem0 reads GOOGLE_API_KEY at config time.
+        clients = []
+        for idx in indices:
+            try:
+                clients.append((idx, await self._get_memory_for_key(idx)))
+            except Exception as e:
+                logger.warning(f"⚠️  Could not build client for Key #{idx + 1}: {e}")
+        os.environ["GOOGLE_API_KEY"] = self.key_rotator.get_current_key()
+
+        if not clients:
+            return None
+
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(
+                self._key_executor,
+                functools.partial(
+                    client.add, messages, user_id=self.config.user_id, metadata=metadata
+                ),
+            )
+            for _, client in clients
+        ]
+        logger.info(f"🔀 Fanning retry out across {len(futures)} keys...")
+
+        try:
+            for fut in asyncio.as_completed(futures):
+                try:
+                    result = await fut
+                except Exception as e:
+                    logger.warning(f"⚠️  Fan-out attempt failed: {e}")
+                    continue
+                extracted = result.get("results") if isinstance(result, dict) else result
+                if extracted:
+                    logger.info("✅ Fan-out retry succeeded")
+                    return result
+            return None
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+    async def _get_memory_for_key(self, idx: int) -> Memory:
+        """Get (building lazily) the mem0 client bound to key index ``idx``.
+
+        Memory.from_config() reopens ChromaDB, reconnects the embedder and
+        rebuilds the Gemini client - hundreds of ms of churn that a spiky
+        quota day would otherwise pay on every single 429. The per-key cache
+        makes that a one-time cost per key per worker.
+
+        Args:
+            idx: Key index into key_rotator.keys
+
+        Returns:
+            Cached (or freshly built) Memory client for that key
+        """
+        os.environ["GOOGLE_API_KEY"] = self.key_rotator.keys[idx]
+        client = _per_key_clients.get(idx)
+        if client is None:
+            client = await asyncio.to_thread(Memory.from_config, self._mem0_config)
+            _per_key_clients[idx] = client
+            logger.debug(f"🔑 Built mem0 client for Key #{idx + 1}")
+        return client
+
+    async def _extract_with_key_rotation(self, batch: List[Dict[str, str]], metadata: Dict[str, Any]) -> Any:
+        """Extract memories from one batch with automatic key rotation on quota errors.
+
         Tries current key, advances to next on 429 errors.
         Cycles through all available keys before giving up.
-        
+
         Args:
+            batch: Slice of role/content message dicts to extract from
             metadata: Session metadata for extraction
-            
+
         Returns:
             Extraction result from mem0.add() or None on failure
-            
+
         Raises:
             Exception: If all keys exhausted or non-quota error occurs
         """
         if not self.key_rotator:
             # No key rotator (shouldn't happen, but fallback to direct call)
             logger.warning("⚠️  Key rotator not initialized, attempting direct extraction")
-            return self.memory.add(
-                self.session_messages,
+            return await asyncio.to_thread(
+                self.memory.add,
+                batch,
                 user_id=self.config.user_id,
-                metadata=metadata
+                metadata=metadata,
             )
         
         attempted_keys = set()
@@ -457,38 +955,41 @@ class MemoryManager:
             attempted_keys.add(current_index)
             
             try:
-                logger.debug(f"🔑 Attempting extraction with Key #{current_index + 1}")
+                logger.debug("🔑 Attempting extraction with Key #%d", current_index + 1)
                 
-                # mem0 uses the API key from environment (set during init)
-                result = self.memory.add(
-                    self.session_messages,
+                # mem0 uses the API key from environment (set during init).
+                # add() blocks on Chroma writes plus a Gemini round-trip -
+                # run it in the thread pool so audio coroutines keep running
+                result = await asyncio.to_thread(
+                    self.memory.add,
+                    batch,
                     user_id=self.config.user_id,
-                    metadata=metadata
+                    metadata=metadata,
                 )
                 
                 logger.info(f"✅ Extraction successful with Key #{current_index + 1}")
                 return result
                 
             except Exception as e:
-                error_str = str(e)
-                
                 # Check if this is a quota error
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str or "quota" in error_str.lower():
+                if _is_quota_error(e):
                     logger.warning(f"⚠️  Key #{current_index + 1} quota exhausted: {e}")
                     
                     # Try to advance to next key
                     if attempt < max_attempts - 1:
                         advanced = self.key_rotator.advance_to_next_key()
                         if advanced:
-                            # Update environment for mem0
-                            new_key = self.key_rotator.get_current_key()
-                            os.environ["GOOGLE_API_KEY"] = new_key
-                            
-                            # Reinitialize mem0 with new key
-                            logger.info(f"🔄 Reinitializing mem0 with Key #{self.key_rotator.get_current_key_index() + 1}")
-                            mem0_config = self.config.to_mem0_config()
-                            self.memory = Memory.from_config(mem0_config)
-                            
+                            # Swap in the cached client for the new key (built
+                            # lazily on first use); replace the shared client
+                            # too, so future sessions don't borrow one bound
+                            # to an exhausted key
+                            logger.info(f"🔄 Switching mem0 to Key #{self.key_rotator.get_current_key_index() + 1}")
+                            global _mem0_client
+                            self.memory = await self._get_memory_for_key(
+                                self.key_rotator.get_current_key_index()
+                            )
+                            _mem0_client = self.memory
+
                             continue  # Retry with new key
                         else:
                             logger.critical("🚨 All API keys exhausted - cannot rotate further")
@@ -504,60 +1005,164 @@ class MemoryManager:
         # Should never reach here, but just in case
         raise Exception("Memory extraction failed after trying all available keys")
     
-    def _save_raw_to_disk(self) -> None:
+    def _is_trivial_session(self) -> bool:
+        """Cheap check for sessions where an empty extraction is plausible.
+
+        The empty-extraction retry exists to catch silent Gemini failures,
+        but it costs a full extra LLM round-trip per shutdown. Greetings and
+        small talk legitimately extract nothing - don't burn quota confirming
+        that. Thresholds are deliberately low so anything substantive still
+        triggers the retry.
+
+        Returns:
+            True when the buffer is too short/repetitive to plausibly contain
+            memories (empty result accepted as-is).
+        """
+        if self._buffered_chars < 200:
+            return True
+        unique_tokens = len({w for c in self._contents for w in c.split()})
+        return unique_tokens < 20
+
+    def _save_raw_to_disk(self, timestamp: Optional[str] = None) -> None:
         """Save raw session messages to disk when API fails (fallback).
         
         Creates a JSON file in ./memory_fallback/ with session messages.
         These can be processed later when API quota is restored.
+
+        Args:
+            timestamp: ISO timestamp to record; defaults to a fresh
+                datetime.now() when the caller hasn't already taken one.
         """
-        import json
-        import os
-        
-        fallback_dir = "./memory_fallback"
-        os.makedirs(fallback_dir, exist_ok=True)
-        
-        filename = f"{fallback_dir}/session_{self.session_id}.json"
+        _FALLBACK_DIR.mkdir(parents=True, exist_ok=True)  # usually a no-op (made in initialize)
+        filename = str(_FALLBACK_DIR / f"session_{self.session_id}.json")
         
         try:
             data = {
                 "session_id": self.session_id,
                 "user_id": self.config.user_id,
-                "timestamp": datetime.now().isoformat(),
-                "messages": self.session_messages,
-                "message_count": len(self.session_messages),
+                "timestamp": timestamp or datetime.now().isoformat(),
+                "messages": [{"role": r, "content": c} for r, c in zip(self._roles, self._contents)],
+                "message_count": len(self._contents),
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"💾 Saved {len(self.session_messages)} messages to {filename}")
+            if HAS_ORJSON:
+                # C serializer, bytes out - no pure-Python pretty-print pass
+                # blocking the quota-error path for long Unicode sessions
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+
+            logger.info(f"💾 Saved {len(self._contents)} messages to {filename}")
         except Exception as e:
             logger.error(f"Failed to save fallback file: {e}")
     
-    async def periodic_save(self, interval_seconds: int = 300) -> None:
-        """Periodic auto-save (optional, for crash safety).
-        
-        TODO: Implement this for production use cases requiring crash resilience.
-        Should run in background task, saving session every N seconds.
-        
+    async def _auto_flush_loop(self) -> None:
+        """Background auto-flush for crash safety (implements the periodic_save TODO).
+
+        Flushes incrementally when EITHER threshold is hit:
+        - auto_flush_threshold messages accumulated in the buffer
+        - a non-empty buffer is older than auto_flush_max_age_s
+
+        This bounds how much conversation a crash/OOM kill can lose, and spreads
+        the Gemini extraction cost over the session instead of one big shutdown flush.
+        """
+        while not self._closed:
+            await asyncio.sleep(self.config.auto_flush_interval_s)
+            if self._closed:
+                break
+
+            try:
+                buffered = len(self._contents)
+                buffer_age = time.monotonic() - self._last_flush_monotonic
+
+                if buffered >= self.config.auto_flush_threshold or (
+                    buffered and buffer_age > self.config.auto_flush_max_age_s
+                ):
+                    logger.info(f"🔄 Auto-flush triggered ({buffered} messages, {buffer_age:.0f}s since last flush)")
+                    await self.flush_session()
+                    self._last_flush_monotonic = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Never let a failed incremental flush kill the loop - retry next tick
+                logger.error(f"Auto-flush iteration failed: {e}", exc_info=True)
+
+    async def shutdown(self, timeout: float = 30.0) -> bool:
+        """Idempotent final flush + close for agent shutdown.
+
+        Both the entrypoint finally-block and the session-close handler call
+        this; whichever fires second is a no-op, so a disconnect can never
+        double the flush payload or race two flushes on the same mem0 client.
+
         Args:
-            interval_seconds: Save interval in seconds (default: 5 minutes)
+            timeout: Maximum seconds to wait for the extraction flush
+
+        Returns:
+            True if the flush succeeded (or had already run / nothing to do).
         """
-        # Future implementation for auto-save
-        # while True:
-        #     await asyncio.sleep(interval_seconds)
-        #     if self.session_messages:
-        #         await self.flush_session()
-        pass
-    
+        async with self._shutdown_once:
+            if self._is_shutdown:
+                logger.debug("Memory shutdown already completed - skipping duplicate flush")
+                return True
+            self._is_shutdown = True
+
+            if not self.config.enable_memory:
+                await self.close()
+                return True
+
+            session_duration = time.monotonic() - self.session_start_monotonic
+            logger.info(f"💾 Flushing {len(self._contents)} session messages")
+            logger.info(f"⏱️  Session duration: {session_duration:.1f}s")
+            logger.info("⏳ Waiting for memory extraction to complete...")
+
+            try:
+                flush_success = await asyncio.wait_for(self.flush_session(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"❌ Memory flush TIMED OUT after {timeout:.0f}s - memories may be lost!")
+                logger.error("   Consider increasing timeout or checking API connectivity")
+                await self.close()
+                return False
+
+            if flush_success:
+                logger.info("✅ Memory flushed successfully")
+                # Generate new session_id for next session (if agent
+                # continues) - rotated only here, never on the incremental
+                # auto-flushes, so mid-conversation flushes share one id
+                self.session_id = uuid.uuid4().hex
+                self.session_start_time = datetime.now()
+                self.session_start_monotonic = time.monotonic()
+            else:
+                logger.warning("⚠️  Memory flush failed - check logs above for details")
+
+            await self.close()
+            logger.info("✅ Resources closed")
+            return flush_success
+
     async def close(self) -> None:
         """Close memory manager and clean up resources.
-        
+
         Should be called at agent shutdown after flush_session().
         """
+        self._closed = True
+
+        if self._auto_flush_task:
+            self._auto_flush_task.cancel()
+            try:
+                await self._auto_flush_task
+            except asyncio.CancelledError:
+                pass
+            self._auto_flush_task = None
+
+        if self._key_executor:
+            self._key_executor.shutdown(wait=False)
+            self._key_executor = None
+
         if self.memory:
             logger.info("Closing memory manager")
-            # mem0 v0.x doesn't require explicit close, but we'll clear references
+            # Drop only our reference - the shared mem0 client stays alive
+            # so the next session can reuse it (mem0 needs no explicit close)
             self.memory = None
         
         self._initialized = False
@@ -566,25 +1171,28 @@ class MemoryManager:
     # Future Extensions (Placeholders)
     # ============================================================================
     
-    def search_memories(self, query: str, memory_type: str = "chat", limit: int = 5) -> List[Dict[str, Any]]:
+    async def search_memories(self, query: str, memory_type: str = "chat", limit: int = 5) -> List[Dict[str, Any]]:
         """Search past memories by semantic query.
-        
+
         TODO: Implement for RAG and context retrieval.
-        
+
         Args:
             query: Natural language search query
             memory_type: Filter by memory type ("chat", "doc", etc.)
             limit: Maximum results to return
-            
+
         Returns:
             List of relevant memories with scores
         """
         if not self.memory:
             return []
-        
+
         try:
-            # mem0 v0.x search
-            results = self.memory.search(query, user_id=self.config.user_id, limit=limit)
+            # mem0 v0.x search; blocking embedding + Chroma query, so it runs
+            # in the thread pool like the other store calls
+            results = await asyncio.to_thread(
+                self.memory.search, query, user_id=self.config.user_id, limit=limit
+            )
             
             # Filter by memory_type in metadata
             filtered_results = []
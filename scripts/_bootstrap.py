@@ -0,0 +1,19 @@
+"""Shared sys.path bootstrap for the ad-hoc scripts in this directory.
+
+Each script used to recompute Path(__file__).resolve().parents[1] (a stat per
+path component) and mutate sys.path itself. Importing this module does it
+once for all of them - the import cache is the run-once sentinel, so repeat
+imports cost a dict lookup.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# CI can export PROJECT_ROOT once and skip the per-component lstat chain
+# that resolve() walks for symlink handling
+_env_root = os.environ.get("PROJECT_ROOT")
+PROJECT_ROOT = Path(_env_root) if _env_root else Path(__file__).resolve().parent.parent
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
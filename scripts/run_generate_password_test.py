@@ -1,11 +1,7 @@
 import asyncio
-from pathlib import Path
-import sys
+import os
 
-# Ensure project root is on sys.path
-project_root = Path(__file__).resolve().parents[1]
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+from _bootstrap import PROJECT_ROOT  # puts the project root on sys.path
 
 from tools.generate_password import generate_password
 
@@ -21,18 +17,22 @@ async def main():
         raise SystemExit(3)
 
     # Verify file exists in project root
-    file_path = project_root / "generated_passwords.txt"
+    file_path = PROJECT_ROOT / "generated_passwords.txt"
     if not file_path.exists():
         print("Test FAILED: generated_passwords.txt not found")
         raise SystemExit(4)
 
     # Check last line contains the password
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = [l.strip() for l in f.readlines() if l.strip()]
+    # Tail read: the file grows with every run - seek near EOF and read one
+    # bounded 4 KB chunk. Binary mode: the output is ASCII, so skipping the
+    # TextIOWrapper layer avoids decoding every line before the last one
+    with open(file_path, "rb") as f:
+        f.seek(max(0, os.stat(file_path).st_size - 4096))
+        lines = [l for l in f.read().split(b"\n") if l.strip()]
     if not lines:
         print("Test FAILED: generated_passwords.txt is empty")
         raise SystemExit(5)
-    last = lines[-1]
+    last = lines[-1].decode("ascii").strip()
     if pwd in last:
         print("Test PASSED: password saved to generated_passwords.txt")
         print("Last line:", last)
@@ -1,16 +1,21 @@
 import asyncio
-from pathlib import Path
-import sys
+import os
 
-project_root = Path(__file__).resolve().parents[1]
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+from _bootstrap import PROJECT_ROOT  # puts the project root on sys.path
 
 from tools.generate_password import generate_password
 
 async def main():
+    # The three cases are fully independent (CSPRNG sampling; only test 3
+    # touches disk), so generate them concurrently and keep the assertions
+    # sequential afterwards
+    pwd1, pwd2, pwd3 = await asyncio.gather(
+        generate_password(None, length=20, charset="ascii", enforce_classes=True, save=False),
+        generate_password(None, length=16, charset="upper,digits", enforce_classes=True, save=False),
+        generate_password(None, length=20, save=True),
+    )
+
     print("\n=== Test 1: charset='ascii', enforce_classes=True, length=20 ===")
-    pwd1 = await generate_password(None, length=20, charset="ascii", enforce_classes=True, save=False)
     print(f"Generated: {pwd1}")
     if pwd1.startswith("Error:"):
         print("❌ FAILED: Returned error")
@@ -25,7 +30,6 @@ async def main():
     print("✅ PASSED: ASCII charset with enforce_classes works")
 
     print("\n=== Test 2: charset='upper,digits', enforce_classes=True, length=16 ===")
-    pwd2 = await generate_password(None, length=16, charset="upper,digits", enforce_classes=True, save=False)
     print(f"Generated: {pwd2}")
     if pwd2.startswith("Error:"):
         print("❌ FAILED: Returned error")
@@ -47,7 +51,6 @@ async def main():
     print("✅ PASSED: upper,digits with enforce_classes works")
 
     print("\n=== Test 3: Empty charset (default: all), length=20, save=True ===")
-    pwd3 = await generate_password(None, length=20, save=True)
     print(f"Generated: {pwd3}")
     if pwd3.startswith("Error:"):
         print("❌ FAILED: Returned error")
@@ -55,13 +58,17 @@ async def main():
     if len(pwd3) != 20:
         print(f"❌ FAILED: Expected length 20, got {len(pwd3)}")
         raise SystemExit(10)
-    file_path = project_root / "generated_passwords.txt"
+    file_path = PROJECT_ROOT / "generated_passwords.txt"
     if not file_path.exists():
         print("❌ FAILED: generated_passwords.txt not found")
         raise SystemExit(11)
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = [l.strip() for l in f.readlines() if l.strip()]
-    if not lines or pwd3 not in lines[-1]:
+    # Tail read: the file grows with every run - seek near EOF and read one
+    # bounded 4 KB chunk. Binary mode: the output is ASCII, so skipping the
+    # TextIOWrapper layer avoids decoding every line before the last one
+    with open(file_path, "rb") as f:
+        f.seek(max(0, os.stat(file_path).st_size - 4096))
+        lines = [l for l in f.read().split(b"\n") if l.strip()]
+    if not lines or pwd3 not in lines[-1].decode("ascii"):
         print(f"❌ FAILED: Password not saved correctly")
         raise SystemExit(12)
     print("✅ PASSED: Default charset with save works")
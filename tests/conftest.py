@@ -1,39 +1,186 @@
 """Pytest configuration and shared fixtures for JARVIS tests.
 
 See /docs_imported/agents/testing.md - Testing patterns and fixtures
+
+The context fixtures are plain dataclass stubs rather than
+AsyncMock(spec=RunContext): the spec'd mock introspects the whole class via
+dir()/getattr() on every fixture call, and no test here asserts on mock call
+records - they only need an object with the right attributes to pass through.
+Reintroduce AsyncMock locally in any future test that needs
+assert_called_with.
 """
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict
+from unittest.mock import MagicMock, patch
+
 import pytest
-from unittest.mock import AsyncMock
-from livekit.agents import RunContext
+
+import tools  # noqa: F401  - warm the package cache before xdist forks workers
+
+# Resolved once at collection time; tests that need project files import this
+# instead of re-walking Path(__file__).resolve() themselves
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Canned payloads for the no-network fixture below
+_CANNED_SEARCH_RESULTS = [
+    {"title": "Python", "body": "Python is a high-level programming language."},
+    {"title": "Python docs", "body": "Official Python documentation."},
+    {"title": "Python tutorial", "body": "A beginner-friendly tutorial."},
+]
+_CANNED_WEATHER_TEXT = "London: ⛅️ +18°C"
+
+
+def pytest_addoption(parser):
+    """Register the opt-in flag for real-network integration tests."""
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="run slow integration tests that hit real network APIs",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow-marked tests unless --run-integration was passed.
+
+    The default developer run used to pay multi-second DDGS/wttr.in RTTs on
+    every invocation that forgot -m "not slow"; now the real-API tests are
+    opt-in instead of opt-out.
+    """
+    if config.getoption("--run-integration"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-integration (real network)")
+    for item in items:
+        if item.get_closest_marker("slow"):
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(autouse=True)
+def _no_network(request):
+    """Stub the tools' network seams for everything not marked ``slow``.
+
+    The non-integration tests exercise formatting and error paths, but
+    without this they still hit DDGS and wttr.in - seconds of RTT per test
+    and flaky CI. Patched at the seams the tools actually use (``ddgs.DDGS``
+    and ``requests.get``); tests that need a failure re-patch locally with a
+    side_effect, which overrides this fixture. ``slow``-marked integration
+    tests get the real network.
+    """
+    if request.node.get_closest_marker("slow"):
+        yield
+        return
+
+    weather_response = MagicMock(status_code=200, text=_CANNED_WEATHER_TEXT)
+    with patch("ddgs.DDGS.text", return_value=list(_CANNED_SEARCH_RESULTS)), \
+         patch("requests.get", return_value=weather_response):
+        yield
+
+
+class FakeSession:
+    """Minimal AgentSession stand-in - tools only ever await generate_reply."""
+
+    async def generate_reply(self, *args, **kwargs):
+        return None
+
+
+@dataclass
+class FakeSpeechHandle:
+    """Speech handle stub for interruption checks."""
+
+    interrupted: bool = False
+
+
+@dataclass
+class FakeRunContext:
+    """RunContext stub passed as the first argument to tool functions."""
+
+    session: Any = field(default_factory=FakeSession)
+    speech_handle: FakeSpeechHandle = field(default_factory=FakeSpeechHandle)
+    userdata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class FakeJob:
+    """Job stub for integration tests."""
+
+    id: str = "test-job-123"
+
+
+class FakeRoom:
+    """Room stub with an await-able connect."""
+
+    name = "test-room"
+
+    async def connect(self, *args, **kwargs):
+        return None
+
+
+@dataclass
+class FakeJobContext:
+    """JobContext stub for integration tests."""
+
+    room: FakeRoom = field(default_factory=FakeRoom)
+    job: FakeJob = field(default_factory=FakeJob)
+
+    async def connect(self, *args, **kwargs):
+        return None
+
+
+@pytest.fixture(scope="session")
+def _shared_session():
+    """One FakeSession for the whole run - it is stateless, so every test
+    can safely share it instead of re-instantiating per function."""
+    return FakeSession()
 
 
 @pytest.fixture
-def mock_context():
-    """Create a mock RunContext for testing tools.
-    
+def mock_context(_shared_session):
+    """Create a stub RunContext for testing tools.
+
     Provides:
-    - session: mocked AgentSession
-    - speech_handle: mocked speech handle for interruption checks
-    - userdata: dict for storing session-specific data
+    - session: shared stateless stub AgentSession (await-able generate_reply)
+    - speech_handle: fresh stub speech handle for interruption checks
+    - userdata: fresh dict for storing session-specific data
+
+    The mutable pieces (speech_handle, userdata) are rebuilt per test for
+    isolation; only the immutable scaffolding is session-scoped.
+    """
+    return FakeRunContext(session=_shared_session)
+
+
+# SMTP mock templates, built once at import: MagicMock construction (child
+# mocks, __enter__ wiring) is repeated per test otherwise. The fixture hands
+# out these singletons and resets call history/side effects on teardown.
+_SMTP_CLS_TEMPLATE = MagicMock()
+_SMTP_SERVER_TEMPLATE = _SMTP_CLS_TEMPLATE.return_value.__enter__.return_value
+_SMTP_SERVER_TEMPLATE.smtp_cls = _SMTP_CLS_TEMPLATE
+
+
+@pytest.fixture
+def smtp_env(monkeypatch):
+    """Gmail credentials plus a mocked smtplib.SMTP_SSL for the email tests.
+
+    Replaces the patch.dict/patch('smtplib.SMTP_SSL') pair that every email
+    test used to open itself. Returns the inner mock server (what
+    ``with SMTP_SSL(...) as server:`` binds), with the class mock reachable
+    as ``server.smtp_cls`` so failure tests can inject connection-level
+    side effects. Teardown clears call records and injected side effects but
+    keeps the template wiring intact for the next test.
     """
-    context = AsyncMock(spec=RunContext)
-    context.session = AsyncMock()
-    context.session.generate_reply = AsyncMock()
-    context.speech_handle = AsyncMock()
-    context.speech_handle.interrupted = False
-    context.userdata = {}
-    return context
+    monkeypatch.setenv("GMAIL_USER", "test@gmail.com")
+    monkeypatch.setenv("GMAIL_APP_PASSWORD", "test_password")
+    _SMTP_SERVER_TEMPLATE.sendmail.return_value = {}
+    monkeypatch.setattr("smtplib.SMTP_SSL", _SMTP_CLS_TEMPLATE)
+    yield _SMTP_SERVER_TEMPLATE
+    # Reset both templates: the class-level cascade doesn't traverse the
+    # __enter__ magic-method chain, so server-side side effects (e.g. a
+    # login failure) would otherwise leak into the next test
+    _SMTP_CLS_TEMPLATE.reset_mock(side_effect=True)
+    _SMTP_SERVER_TEMPLATE.reset_mock(side_effect=True)
 
 
 @pytest.fixture
 def mock_job_context():
-    """Create a mock JobContext for integration tests."""
-    from unittest.mock import MagicMock
-    
-    context = MagicMock()
-    context.room = AsyncMock()
-    context.room.name = "test-room"
-    context.connect = AsyncMock()
-    context.job = MagicMock()
-    context.job.id = "test-job-123"
-    return context
+    """Create a stub JobContext for integration tests."""
+    return FakeJobContext()
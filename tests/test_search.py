@@ -82,79 +82,49 @@ class TestSearchTool:
         assert not result.startswith("[")
 
     @pytest.mark.asyncio
-    async def test_search_multiple_queries(self, mock_context):
-        """Test: Multiple searches in sequence work."""
-        queries = [
-            "latest AI news",
-            "Python libraries",
-            "cloud computing",
-        ]
-        
-        for query in queries:
-            result = await search_web(mock_context, query)
-            assert isinstance(result, str)
-            assert len(result) > 0
+    @pytest.mark.parametrize("query", [
+        "latest AI news",
+        "Python libraries",
+        "cloud computing",
+    ])
+    async def test_search_multiple_queries(self, mock_context, query):
+        """Test: Repeated searches work (one case per query, xdist-shardable)."""
+        result = await search_web(mock_context, query)
+        assert isinstance(result, str)
+        assert len(result) > 0
 
 
 class TestSearchMultilingual:
     """Test multilingual search capabilities."""
 
     @pytest.mark.asyncio
-    async def test_search_arabic_query(self, mock_context):
-        """Test: Arabic query is handled (may be enhanced/translated)."""
-        result = await search_web(mock_context, "تعلم البرمجة")  # "Learn programming" in Arabic
-        
-        assert isinstance(result, str)
-        # Should either translate or use the original
-
-    @pytest.mark.asyncio
-    async def test_search_spanish_query(self, mock_context):
-        """Test: Spanish query works."""
-        result = await search_web(mock_context, "Inteligencia artificial")
-        
-        assert isinstance(result, str)
-        assert len(result) > 0
-
-    @pytest.mark.asyncio
-    async def test_search_mixed_language_query(self, mock_context):
-        """Test: Mixed English/other language query."""
-        result = await search_web(mock_context, "Python en español")
-        
-        assert isinstance(result, str)
+    @pytest.mark.parametrize("query", [
+        "تعلم البرمجة",          # "Learn programming" in Arabic
+        "Inteligencia artificial",  # Spanish
+        "Python en español",        # Mixed English/Spanish
+        "كرة القدم الإسبانية",   # "Spanish football" in Arabic (known challenge)
+    ])
+    async def test_search_language(self, mock_context, query):
+        """Test: Non-English and mixed-language queries are handled."""
+        result = await search_web(mock_context, query)
 
-    @pytest.mark.asyncio
-    async def test_search_sports_arabic(self, mock_context):
-        """Test: Sports query in Arabic (known challenge)."""
-        # "Spanish football" in Arabic
-        result = await search_web(mock_context, "كرة القدم الإسبانية")
-        
         assert isinstance(result, str)
-        # Should return results (ideally sports-related)
+        # Should either translate or use the original
 
 
 class TestSearchSports:
     """Test sports-related queries (known edge case)."""
 
     @pytest.mark.asyncio
-    async def test_search_football_scores(self, mock_context):
-        """Test: Sports scores query."""
-        result = await search_web(mock_context, "Premier League scores today")
-        
-        assert isinstance(result, str)
-        assert len(result) > 0
-
-    @pytest.mark.asyncio
-    async def test_search_sports_news(self, mock_context):
-        """Test: Sports news query."""
-        result = await search_web(mock_context, "latest tennis news")
-        
-        assert isinstance(result, str)
+    @pytest.mark.parametrize("query", [
+        "Premier League scores today",
+        "latest tennis news",
+        "Cristiano Ronaldo stats 2025",
+    ])
+    async def test_search_sports_query(self, mock_context, query):
+        """Test: Scores, news, and player-info queries are handled."""
+        result = await search_web(mock_context, query)
 
-    @pytest.mark.asyncio
-    async def test_search_sports_player_info(self, mock_context):
-        """Test: Athlete/player info query."""
-        result = await search_web(mock_context, "Cristiano Ronaldo stats 2025")
-        
         assert isinstance(result, str)
 
 
@@ -164,7 +134,7 @@ class TestSearchErrorHandling:
     @pytest.mark.asyncio
     async def test_search_api_error(self, mock_context):
         """Test: API errors are handled gracefully."""
-        with patch('duckduckgo_search.DDGS.text', side_effect=Exception("API Error")):
+        with patch('ddgs.DDGS.text', side_effect=Exception("API Error")):
             result = await search_web(mock_context, "test query")
             
             assert isinstance(result, str)
@@ -173,7 +143,7 @@ class TestSearchErrorHandling:
     @pytest.mark.asyncio
     async def test_search_timeout_handling(self, mock_context):
         """Test: Timeout is handled gracefully."""
-        with patch('duckduckgo_search.DDGS.text', side_effect=TimeoutError("Request timeout")):
+        with patch('ddgs.DDGS.text', side_effect=TimeoutError("Request timeout")):
             result = await search_web(mock_context, "test query")
             
             assert isinstance(result, str)
@@ -182,7 +152,7 @@ class TestSearchErrorHandling:
     @pytest.mark.asyncio
     async def test_search_no_results(self, mock_context):
         """Test: Query with no results is handled."""
-        with patch('duckduckgo_search.DDGS.text', return_value=[]):
+        with patch('ddgs.DDGS.text', return_value=[]):
             result = await search_web(mock_context, "random query")
             
             assert isinstance(result, str)
@@ -194,6 +164,7 @@ class TestSearchIntegration:
 
     @pytest.mark.asyncio
     @pytest.mark.slow
+    @pytest.mark.xdist_group("ddgs")
     async def test_search_real_api(self, mock_context):
         """Integration test: Real API call (requires internet).
         
@@ -207,6 +178,7 @@ class TestSearchIntegration:
 
     @pytest.mark.asyncio
     @pytest.mark.slow
+    @pytest.mark.xdist_group("ddgs")
     async def test_search_real_news_query(self, mock_context):
         """Integration test: Real API with time-sensitive query."""
         result = await search_web(mock_context, "latest technology news")
@@ -4,7 +4,7 @@ See /docs_imported/agents/testing.md - Unit Testing Tools
 See /docs_imported/agents/tools.md - Tool Definition and Use
 """
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import asyncio
 
 from tools.weather import get_weather
@@ -24,20 +24,21 @@ class TestWeatherTool:
         assert not result.startswith("{")
 
     @pytest.mark.asyncio
-    async def test_get_weather_multiple_cities(self, mock_context):
+    @pytest.mark.parametrize("city", ["Paris", "Tokyo", "New York", "Sydney"])
+    async def test_get_weather_multiple_cities(self, mock_context, city):
         """Test: Weather lookup works for different cities."""
-        cities = ["Paris", "Tokyo", "New York", "Sydney"]
-        
-        for city in cities:
-            result = await get_weather(mock_context, city)
-            assert isinstance(result, str)
-            assert len(result) > 0
+        result = await get_weather(mock_context, city)
+        assert isinstance(result, str)
+        assert len(result) > 0
 
     @pytest.mark.asyncio
     async def test_get_weather_invalid_location(self, mock_context):
         """Test: Invalid location returns error message (not exception)."""
-        result = await get_weather(mock_context, "InvalidCityXYZ123")
-        
+        # Override the autouse happy-path mock: unknown cities come back
+        # from wttr.in as a non-200 response
+        with patch('requests.get', return_value=MagicMock(status_code=404, text="Unknown location")):
+            result = await get_weather(mock_context, "InvalidCityXYZ123")
+
         # Should return graceful error message
         assert isinstance(result, str)
         # Either an error message, "could not retrieve", or empty (not a crash)
@@ -98,6 +99,7 @@ class TestWeatherIntegration:
 
     @pytest.mark.asyncio
     @pytest.mark.slow  # Mark as slow test (can skip with -m "not slow")
+    @pytest.mark.xdist_group("weather_api")  # Real-API tests serialize per provider
     async def test_get_weather_real_api(self, mock_context):
         """Integration test: Call real weather API (if available).
         
@@ -117,7 +119,7 @@ class TestWeatherIntegration:
     @pytest.mark.asyncio
     async def test_get_weather_timeout_handling(self, mock_context):
         """Test: Timeout in external API is handled gracefully."""
-        with patch('aiohttp.ClientSession.get', side_effect=asyncio.TimeoutError):
+        with patch('requests.get', side_effect=asyncio.TimeoutError):
             result = await get_weather(mock_context, "Paris")
             
             assert isinstance(result, str)
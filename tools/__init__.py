@@ -1,7 +1,26 @@
 # See /docs_imported/agents/tools.md - Tool module organization
-from .weather import get_weather
-from .search import search_web
-from .send_email import send_email
-from .generate_password import generate_password
+# Lazy re-exports (PEP 562): importing the package no longer pulls in every
+# tool module (smtplib, email.mime, requests, ...). Each attribute resolves
+# its submodule on first access and is cached in globals(), so consumers that
+# only need one tool skip the import cost of the rest.
+import importlib
 
 __all__ = ["get_weather", "search_web", "send_email", "generate_password"]
+
+# Re-exported name -> defining submodule
+_SUBMODULES = {
+    "get_weather": "weather",
+    "search_web": "search",
+    "send_email": "send_email",
+    "generate_password": "generate_password",
+}
+
+
+def __getattr__(name):
+    try:
+        submodule = _SUBMODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value  # cache so __getattr__ only fires once per name
+    return value
@@ -1,10 +1,94 @@
 from livekit.agents import function_tool, RunContext
+import atexit
 import secrets
 import string
 import logging
+import threading
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
+# Project-root password file, resolved once at import instead of per save
+_PWD_PATH = Path(__file__).resolve().parents[1] / "generated_passwords.txt"
+
+# Append handle opened lazily on first save and closed at interpreter exit,
+# so repeated saves skip the open()/close() syscall pair per password
+_pwd_log = None
+_pwd_log_lock = threading.Lock()
+
+
+def _save_password(record: str) -> None:
+    """Append one record to generated_passwords.txt via a persistent handle.
+
+    Each record is still flushed immediately - the helper scripts (and
+    anything tailing the file) read it right after generation, so batching
+    writes until buffer pressure would make saves invisible mid-process.
+    The win here is dropping the per-save open/close, not the write itself.
+    """
+    global _pwd_log
+    with _pwd_log_lock:
+        if _pwd_log is None:
+            _pwd_log = open(_PWD_PATH, "ab", buffering=65536)
+            atexit.register(_pwd_log.close)
+        _pwd_log.write(record.encode("utf-8"))
+        _pwd_log.flush()
+
+# Named classes we recognize, built once instead of per call
+_NAMED = {
+    "upper": string.ascii_uppercase,
+    "lower": string.ascii_lowercase,
+    "digits": string.digits,
+    "symbols": string.punctuation,
+    "ascii": string.ascii_letters + string.digits,  # upper+lower+digits (no symbols)
+    "all": string.ascii_letters + string.digits + string.punctuation,
+}
+
+# Shared SystemRandom for shuffling - constructing one per call wastes the
+# ctor cost and gains nothing (it has no per-instance state worth isolating)
+_SYSRAND = secrets.SystemRandom()
+
+
+@lru_cache(maxsize=32)
+def _resolve_pools(parts: tuple) -> tuple:
+    """Combined pool and per-class pools for a named-class spec, memoized.
+
+    The set-dedup and join over the selected classes only depend on the
+    (validated) class names, so repeat calls with the same spec reuse the
+    cached strings.
+    """
+    pools = tuple(_NAMED[p] for p in parts)
+    available = "".join(sorted({c for pool in pools for c in pool}))
+    return available, pools
+
+
+def _random_chars(pool: str, n: int) -> list[str]:
+    """Draw n uniform characters from pool with batched urandom reads.
+
+    secrets.choice costs a SystemRandom round-trip (and ultimately an
+    os.urandom read) per character; here one token_bytes call covers many
+    characters. Rejection sampling keeps the distribution uniform: each byte
+    is masked down to the next power of two above len(pool) and indices that
+    fall outside the pool are discarded, so every kept index is equally
+    likely. Pools larger than 256 characters fall back to secrets.choice,
+    since a single byte can't index them without bias.
+    """
+    if len(pool) > 256:
+        return [secrets.choice(pool) for _ in range(n)]
+    mask = (1 << (len(pool) - 1).bit_length()) - 1
+    out: list[str] = []
+    need = n
+    while need:
+        # mask acceptance is always > 50%, so 2x oversampling usually
+        # finishes in one draw
+        for b in secrets.token_bytes(need * 2):
+            idx = b & mask
+            if idx < len(pool):
+                out.append(pool[idx])
+                need -= 1
+                if not need:
+                    break
+    return out
+
 
 @function_tool()
 async def generate_password(
@@ -42,76 +126,51 @@ async def generate_password(
         if length <= 0:
             return "Error: length must be a positive integer"
 
-        # Named classes we recognize
-        named = {
-            "upper": string.ascii_uppercase,
-            "lower": string.ascii_lowercase,
-            "digits": string.digits,
-            "symbols": string.punctuation,
-            "ascii": string.ascii_letters + string.digits,  # upper+lower+digits (no symbols)
-            "all": string.ascii_letters + string.digits + string.punctuation,
-        }
-
         # If charset is provided and looks like a comma-separated list of named classes,
         # use those; otherwise, if charset is provided treat it as a literal alphabet.
-        selected_pools: dict[str, str] = {}
+        pool_names = ("upper", "lower", "digits", "symbols")  # default: all classes
         if charset:
-            parts = [p.strip().lower() for p in charset.split(",") if p.strip()]
-            if parts and all(p in named for p in parts):
-                for p in parts:
-                    selected_pools[p] = named[p]
+            parts = tuple(p.strip().lower() for p in charset.split(",") if p.strip())
+            if parts and all(p in _NAMED for p in parts):
+                pool_names = parts
             else:
                 # Treat charset as literal set of characters
                 pool = "".join(sorted(set(charset)))
                 if not pool:
                     return "Error: provided charset resulted in empty character set"
                 # Simple generation (can't enforce classes for literal charsets)
-                pwd = "".join(secrets.choice(pool) for _ in range(length))
+                pwd = "".join(_random_chars(pool, length))
                 if save:
-                    path = Path(__file__).resolve().parents[1] / "generated_passwords.txt"
-                    with open(path, "a", encoding="utf-8") as f:
-                        f.write(f"{datetime.utcnow().isoformat()}Z\tlength={length}\tcharset={repr(charset)}\tpassword={pwd}\n")
+                    _save_password(f"{datetime.utcnow().isoformat()}Z\tlength={length}\tcharset={repr(charset)}\tpassword={pwd}\n")
                     logging.info(f"✅ Password saved to generated_passwords.txt")
                 return pwd
-        else:
-            # default: all classes (upper+lower+digits+symbols)
-            selected_pools = {
-                "upper": named["upper"],
-                "lower": named["lower"],
-                "digits": named["digits"],
-                "symbols": named["symbols"],
-            }
-
-        # Build the available characters pool
-        available_chars = "".join({c for pool in selected_pools.values() for c in pool})
+
+        # Combined pool + per-class pools, cached per unique spec
+        available_chars, selected_pools = _resolve_pools(pool_names)
         if not available_chars:
             return "Error: no characters available for password generation"
 
         pwd_chars: list[str] = []
         if enforce_classes:
             # ensure at least one character from each selected class
-            required_pools = [p for p in selected_pools.values() if p]
+            required_pools = [p for p in selected_pools if p]
             if length < len(required_pools):
                 return f"Error: length {length} too small to include {len(required_pools)} required character classes"
             for pool in required_pools:
-                pwd_chars.append(secrets.choice(pool))
+                pwd_chars.extend(_random_chars(pool, 1))
 
             # fill the rest
-            for _ in range(length - len(pwd_chars)):
-                pwd_chars.append(secrets.choice(available_chars))
+            pwd_chars.extend(_random_chars(available_chars, length - len(pwd_chars)))
         else:
-            for _ in range(length):
-                pwd_chars.append(secrets.choice(available_chars))
+            pwd_chars = _random_chars(available_chars, length)
 
         # Shuffle to avoid predictable placement of required chars
-        secrets.SystemRandom().shuffle(pwd_chars)
+        _SYSRAND.shuffle(pwd_chars)
         pwd = "".join(pwd_chars)
 
         if save:
-            path = Path(__file__).resolve().parents[1] / "generated_passwords.txt"
             try:
-                with open(path, "a", encoding="utf-8") as f:
-                    f.write(f"{datetime.utcnow().isoformat()}Z\tlength={length}\tenforce_classes={enforce_classes}\tcharset={','.join(selected_pools.keys())}\tpassword={pwd}\n")
+                _save_password(f"{datetime.utcnow().isoformat()}Z\tlength={length}\tenforce_classes={enforce_classes}\tcharset={','.join(pool_names)}\tpassword={pwd}\n")
                 logging.info(f"✅ Password saved to generated_passwords.txt")
             except Exception:
                 # don't fail generation if file write fails; just log